@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+CPU per recipient for personalized invitations: rendering and MIME-encoding
+the whole message per recipient versus PersonalizedMessage segments
+
+    cd backend
+    python benchmarks/personalized_message_benchmark.py --recipients 2000
+
+The script checks that both decode to the same HTML before timing them,
+and reports the shared-body PreparedMessage as the floor.
+"""
+import argparse
+import email
+import os
+import sys
+import time
+from email import policy
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.email_service import PersonalizedMessage, PreparedMessage, _wrap_html
+from utils.template_generator import template_generator, merge_values
+
+SENDER = 'organizer@example.com'
+
+def full_message(recipient: str, html: str, subject: str) -> bytes:
+    """Render the recipient's copy and encode the whole MIME message"""
+    msg = MIMEText(html, 'html', 'utf-8')
+    msg['Subject'] = subject
+    msg['From'] = SENDER
+    msg['To'] = recipient
+    return msg.as_string().replace('\n', '\r\n').encode('ascii')
+
+def decoded(message: bytes) -> str:
+    body = email.message_from_bytes(message, policy=policy.default).get_payload(decode=True)
+    return body.decode('utf-8').replace('\r\n', '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-recipient CPU of personalized messages')
+    parser.add_argument('--recipients', type=int, default=2000)
+    args = parser.parse_args()
+
+    template = template_generator.generate_template(
+        'formal_internal',
+        meeting_topic='Quarterly Planning',
+        speaker_name='Jane Smith',
+        meeting_date='2024-01-15',
+        meeting_time='14:00',
+        meeting_link='https://meet.example.com/abc',
+        additional_notes='Hello {{name}} from {{organization}}, your link: {{join_link}}'
+    )
+    content, subject = template['content'], template['subject']
+    recipients = [f"user{i}@example.com" for i in range(args.recipients)]
+    values = [merge_values(r, f"User {i}", 'Example Org', 'https://meet.example.com/abc') for i, r in enumerate(recipients)]
+
+    personalized = PersonalizedMessage(content, subject, SENDER)
+    bodies = template_generator.render_batch(_wrap_html(content, subject), values)
+    first = next(bodies)
+    assert decoded(personalized.for_recipient(recipients[0], values[0])) == first
+    assert decoded(full_message(recipients[0], first, subject)) == first
+
+    started = time.process_time()
+    bodies = template_generator.render_batch(_wrap_html(content, subject), values)
+    full_bytes = sum(len(full_message(r, body, subject)) for r, body in zip(recipients, bodies))
+    full = time.process_time() - started
+
+    started = time.process_time()
+    personalized = PersonalizedMessage(content, subject, SENDER)
+    segment_bytes = sum(len(personalized.for_recipient(r, v)) for r, v in zip(recipients, values))
+    segmented = time.process_time() - started
+
+    started = time.process_time()
+    prepared = PreparedMessage(content, subject, SENDER)
+    shared_bytes = sum(len(prepared.for_recipient(r)) for r in recipients)
+    shared = time.process_time() - started
+
+    substituted = sum(len(v['name']) + len(v['organization']) + len(v['join_link']) for v in values) // args.recipients
+    print(f"{args.recipients} recipients, ~{substituted} substituted characters each")
+    print(f"{'mode':<14}{'total s':>10}{'us/msg':>10}{'bytes/msg':>12}")
+    for name, seconds, size in (('full render', full, full_bytes), ('segments', segmented, segment_bytes),
+                                ('shared body', shared, shared_bytes)):
+        print(f"{name:<14}{seconds:>10.3f}{seconds / args.recipients * 1e6:>10.1f}{size // args.recipients:>12}")
+    print(f"speedup over full render: {full / segmented:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CPU per message: building the MIME message per recipient versus PreparedMessage
+
+    cd backend
+    python benchmarks/prepared_message_benchmark.py --recipients 2000
+
+Both paths produce the bytes handed to smtplib.sendmail; the script checks
+that they are identical before timing them.
+"""
+import argparse
+import os
+import sys
+import time
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.email_service import PreparedMessage, _wrap_html
+from utils.template_generator import template_generator
+
+SENDER = 'organizer@example.com'
+
+def legacy_message(recipient: str, template_content: str, subject: str) -> bytes:
+    """What send_gmail_invitation built for every recipient before PreparedMessage"""
+    msg = MIMEText(_wrap_html(template_content, subject), 'html', 'utf-8')
+    msg['Subject'] = subject
+    msg['From'] = SENDER
+    msg['To'] = recipient
+    msg['Content-Type'] = 'text/html; charset=utf-8'
+    # smtplib.sendmail normalizes line endings and encodes str messages
+    return msg.as_string().replace('\n', '\r\n').encode('ascii')
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-message CPU of MIME construction')
+    parser.add_argument('--recipients', type=int, default=2000)
+    parser.add_argument('--notes-kb', type=int, default=20, help='extra template body size')
+    args = parser.parse_args()
+
+    template = template_generator.generate_template(
+        'formal_internal',
+        meeting_topic='Quarterly Planning',
+        speaker_name='Jane Smith',
+        meeting_date='2024-01-15',
+        meeting_time='14:00',
+        duration='60 minutes',
+        meeting_link='https://meet.example.com/abc',
+        additional_notes='Agenda item. ' * (args.notes_kb * 1024 // 13)
+    )
+    content, subject = template['content'], template['subject']
+    recipients = [f"user{i}@example.com" for i in range(args.recipients)]
+
+    prepared = PreparedMessage(content, subject, SENDER)
+    assert prepared.for_recipient(recipients[0]) == legacy_message(recipients[0], content, subject)
+
+    started = time.process_time()
+    legacy_bytes = sum(len(legacy_message(r, content, subject)) for r in recipients)
+    legacy = time.process_time() - started
+
+    started = time.process_time()
+    prepared = PreparedMessage(content, subject, SENDER)
+    prepared_bytes = sum(len(prepared.for_recipient(r)) for r in recipients)
+    reused = time.process_time() - started
+    assert legacy_bytes == prepared_bytes
+
+    size = prepared_bytes // args.recipients
+    print(f"{args.recipients} recipients, {size} bytes per message")
+    print(f"{'mode':<10}{'total s':>10}{'us/msg':>10}")
+    print(f"{'legacy':<10}{legacy:>10.3f}{legacy / args.recipients * 1e6:>10.1f}")
+    print(f"{'prepared':<10}{reused:>10.3f}{reused / args.recipients * 1e6:>10.1f}")
+    print(f"speedup: {legacy / reused:.1f}x")
+
+if __name__ == '__main__':
+    main()
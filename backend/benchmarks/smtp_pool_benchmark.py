@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+SMTP throughput: one session per message versus the pooled sessions
+
+    cd backend
+    python benchmarks/smtp_pool_benchmark.py --messages 200 --latency-ms 5
+
+Runs against the local sink in smtp_sink.py, so no mail leaves the machine.
+"""
+import argparse
+import os
+import smtplib
+import sys
+import time
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.smtp_sink import start_sink
+from utils.smtp_pool import SMTPPool
+
+def build_message(recipient: str) -> str:
+    msg = MIMEText('<p>Meeting invitation</p>' * 50, 'html', 'utf-8')
+    msg['Subject'] = 'Meeting Invitation'
+    msg['From'] = 'bench@example.com'
+    msg['To'] = recipient
+    return msg.as_string()
+
+def send_unpooled(host: str, port: int, recipients) -> None:
+    """What email_service did before the pool: connect, log in and quit per message"""
+    for recipient in recipients:
+        server = smtplib.SMTP(host, port)
+        server.login('bench', 'secret')
+        server.sendmail('bench@example.com', recipient, build_message(recipient))
+        server.quit()
+
+def send_pooled(pool: SMTPPool, recipients) -> None:
+    for recipient in recipients:
+        pool.send('bench@example.com', recipient, build_message(recipient))
+
+def main():
+    parser = argparse.ArgumentParser(description='SMTP pool throughput against a local sink')
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=5, help='per-reply delay added by the sink')
+    parser.add_argument('--max-messages', type=int, default=100, help='messages per pooled session')
+    args = parser.parse_args()
+
+    sink = start_sink(latency_ms=args.latency_ms)
+    host, port = sink.server_address
+    recipients = [f"user{i}@example.com" for i in range(args.messages)]
+
+    started = time.perf_counter()
+    send_unpooled(host, port, recipients)
+    unpooled = time.perf_counter() - started
+    connections = sink.stats.snapshot()['connections']
+
+    pool = SMTPPool(host, port, username='bench', password='secret', use_tls=False,
+                    size=1, max_messages=args.max_messages)
+    started = time.perf_counter()
+    send_pooled(pool, recipients)
+    pooled = time.perf_counter() - started
+    pool.close()
+
+    print(f"{'mode':<10}{'seconds':>10}{'msg/s':>10}{'sessions':>10}")
+    print(f"{'unpooled':<10}{unpooled:>10.3f}{args.messages / unpooled:>10.1f}{connections:>10}")
+    print(f"{'pooled':<10}{pooled:>10.3f}{args.messages / pooled:>10.1f}{pool.stats()['opened']:>10}")
+    print(f"speedup: {unpooled / pooled:.1f}x")
+    sink.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Local SMTP sink for load tests
+
+Speaks just enough SMTP (EHLO/HELO, AUTH, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT) to accept and count messages, then throws them away. No STARTTLS, so
+point the app at it with SMTP_USE_TLS=false:
+
+    python benchmarks/smtp_sink.py --port 2525 --latency-ms 20
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_USE_TLS=false python main.py
+
+--latency-ms delays the greeting and every reply, to mimic a remote server.
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+class SinkStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+
+    def add(self, name: str, amount: int = 1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self.lock:
+            return {'connections': self.connections, 'messages': self.messages, 'recipients': self.recipients}
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        stats = self.server.stats
+        stats.add('connections')
+        self.reply('220 smtp-sink ready')
+        recipients = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.wfile.write(b'250-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n')
+                self.reply('250 SIZE 52428800')
+            elif verb == 'HELO':
+                self.reply('250 smtp-sink')
+            elif verb == 'AUTH':
+                parts = command.split()
+                if parts[1].upper() == 'LOGIN' and len(parts) == 2:
+                    self.reply('334 VXNlcm5hbWU6')
+                    self.rfile.readline()
+                if parts[1].upper() == 'LOGIN':
+                    self.reply('334 UGFzc3dvcmQ6')
+                    self.rfile.readline()
+                self.reply('235 2.7.0 Accepted')
+            elif verb == 'MAIL':
+                recipients = 0
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients += 1
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                stats.add('messages')
+                stats.add('recipients', recipients)
+                self.reply('250 OK queued')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, latency_ms: float = 0):
+        super().__init__(address, SMTPSinkHandler)
+        self.latency = latency_ms / 1000.0
+        self.stats = SinkStats()
+
+def start_sink(host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0) -> SMTPSink:
+    """Run a sink on a background thread; port 0 picks a free port"""
+    sink = SMTPSink((host, port), latency_ms)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    return sink
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2525)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    sink = SMTPSink((args.host, args.port), args.latency_ms)
+    print(f"SMTP sink listening on {args.host}:{args.port}")
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        print(sink.stats.snapshot())
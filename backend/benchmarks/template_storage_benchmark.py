@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Storage and read cost of saved templates: rendered HTML in full_mom, bodies
+stored once per digest in template_bodies, and template_params rendered on
+read
+
+    cd backend
+    python benchmarks/template_storage_benchmark.py --templates 150 --copies 4
+
+Every distinct invitation is saved --copies times in each form, to a scratch
+SQLite database through SQLiteService. The script checks that get_template
+returns the same content for all three, and that deleting the templates
+collects every stored body. It then reports bytes stored and read per
+template, and get_template time with cold and warm caches. A warm body read
+fetches only the digest; past BODY_CACHE_MAX_BYTES and
+RENDER_CACHE_MAX_BYTES, warm reads are cold reads.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import body_store
+from utils.sqlite_service import SQLiteService
+from utils.template_generator import template_generator
+
+def generated(index: int) -> dict:
+    """What the generate-template route saves for one form submission"""
+    data = template_generator.generate_template(
+        list(template_generator.templates)[index % len(template_generator.templates)],
+        meeting_topic=f'Quarterly Planning {index}',
+        speaker_name='Jane Smith',
+        meeting_date='2024-01-15',
+        meeting_time='14:00',
+        duration='60 minutes',
+        meeting_link=f'https://meet.example.com/{index}',
+        location='Room 4',
+        attendees=['Alice', 'Bob', 'Carol'],
+        additional_notes='Review goals and budget.'
+    )
+    return {
+        'user_id': 'user-1',
+        'title': data['title'],
+        'content': data['content'],
+        'meeting_date': data['meeting_date'],
+        'duration': data['duration'],
+        'additional_notes': data['additional_notes'],
+        'meeting_type': data['meeting_type'],
+        'template_params': data['params'],
+        'template_version': data['template_version']
+    }
+
+def scalar(db: SQLiteService, sql: str, params=()) -> int:
+    return db.connect().execute(sql, params).fetchone()[0] or 0
+
+def minutes_bytes(db: SQLiteService, ids) -> int:
+    """Bytes of the template columns in the meeting_minutes rows of ids"""
+    sql = ('SELECT coalesce(length(CAST(full_mom AS BLOB)), 0) + coalesce(length(CAST(template_params AS BLOB)), 0) '
+           '+ coalesce(length(body_digest), 0) FROM meeting_minutes WHERE meeting_id = ?')
+    return sum(scalar(db, sql, (template_id,)) for template_id in ids)
+
+def timed_reads(db: SQLiteService, ids) -> float:
+    started = time.perf_counter()
+    for template_id in ids:
+        db.get_template(template_id)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description='Saved template storage and read cost')
+    parser.add_argument('--templates', type=int, default=150, help='distinct invitations')
+    parser.add_argument('--copies', type=int, default=4, help='saves of each invitation')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = SQLiteService(os.path.join(directory, 'templates.db'))
+        templates = [generated(i) for i in range(args.templates)] * args.copies
+        n = len(templates)
+
+        # Legacy rows: the rendered HTML inline in full_mom
+        legacy_ids = [row['id'] for row in db.create_templates([dict(t, template_params=None) for t in templates])]
+        db.connect().executemany('UPDATE meeting_minutes SET full_mom = ?, body_digest = NULL WHERE meeting_id = ?',
+                                 [(t['content'], i) for t, i in zip(templates, legacy_ids)])
+        assert scalar(db, 'SELECT COUNT(*) FROM template_bodies') == 0
+        body_ids = [row['id'] for row in db.create_templates([dict(t, template_params=None) for t in templates])]
+        param_ids = [row['id'] for row in db.create_templates(templates)]
+
+        for ids in (legacy_ids, body_ids, param_ids):
+            assert all(db.get_template(i)['content'] == t['content'] for i, t in zip(ids, templates))
+        blobs = scalar(db, 'SELECT COUNT(*) FROM template_bodies')
+        blob_bytes = scalar(db, 'SELECT SUM(length(CAST(body AS BLOB))) FROM template_bodies')
+        raw_bytes = scalar(db, 'SELECT SUM(size) FROM template_bodies')
+        stored = {
+            'full_mom': minutes_bytes(db, legacy_ids),
+            'bodies': minutes_bytes(db, body_ids) + blob_bytes,
+            'params': minutes_bytes(db, param_ids)
+        }
+        # Per read, cold: a body read also fetches the body once per process
+        read = {
+            'full_mom': stored['full_mom'] // n,
+            'bodies': minutes_bytes(db, body_ids) // n + blob_bytes // blobs,
+            'params': stored['params'] // n
+        }
+
+        timings = {}
+        for name, ids, caches in (('full_mom', legacy_ids, ()),
+                                  ('bodies', body_ids, (body_store.body_cache,)),
+                                  ('params', param_ids, (template_generator.render_cache,))):
+            timed_reads(db, ids)
+            for cache in caches:
+                cache.clear()
+            timings[name] = (timed_reads(db, ids), timed_reads(db, ids))
+
+        for template_id in body_ids:
+            db.delete_template(template_id)
+        assert scalar(db, 'SELECT COUNT(*) FROM template_bodies') == 0
+
+        print(f"{n} templates, {args.templates} distinct; {blobs} stored bodies, "
+              f"{raw_bytes / max(blob_bytes, 1):.1f}x compressed")
+        print(f"{'storage':<10}{'stored B':>10}{'read B':>10}{'cold us':>10}{'warm us':>10}")
+        for name, (cold, warm) in timings.items():
+            print(f"{name:<10}{stored[name] // n:>10}{read[name]:>10}{cold / n * 1e6:>10.1f}{warm / n * 1e6:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -11,16 +11,110 @@ class Config:
     SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY', 'your-anon-key')
     SUPABASE_SERVICE_ROLE_KEY = os.environ.get('SUPABASE_SERVICE_ROLE_KEY', 'your-service-role-key')
     
+    # Supabase HTTP connection pool (per worker process)
+    HTTP_POOL_MAX_CONNECTIONS = int(os.environ.get('HTTP_POOL_MAX_CONNECTIONS', '20'))
+    HTTP_POOL_MAX_KEEPALIVE = int(os.environ.get('HTTP_POOL_MAX_KEEPALIVE', '10'))
+    HTTP_POOL_KEEPALIVE_EXPIRY = float(os.environ.get('HTTP_POOL_KEEPALIVE_EXPIRY', '60'))
+    HTTP_HTTP2 = os.environ.get('HTTP_HTTP2', 'auto')  # 'auto', 'true' or 'false'
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '30'))
+    HTTP_WRITE_TIMEOUT = float(os.environ.get('HTTP_WRITE_TIMEOUT', '30'))
+    HTTP_POOL_TIMEOUT = float(os.environ.get('HTTP_POOL_TIMEOUT', '5'))
+    
+    # Storage backend: 'supabase', or 'sqlite' for local load tests and
+    # profiling (SQLITE_PATH ':memory:' keeps everything in process)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'supabase')
+    SQLITE_PATH = os.environ.get('SQLITE_PATH', 'smartmeeting.db')
+    # Simulated network round trip added to every sqlite backend call
+    STORAGE_LATENCY_MS = float(os.environ.get('STORAGE_LATENCY_MS', '0'))
+    STORAGE_LATENCY_JITTER_MS = float(os.environ.get('STORAGE_LATENCY_JITTER_MS', '0'))
+    
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
     # Template Configuration
     DEFAULT_TEMPLATE_TYPE = 'formal_internal'
+    TEMPLATE_PAGE_SIZE = int(os.environ.get('TEMPLATE_PAGE_SIZE', '20'))
+    
+    # Dashboard counters: PostgREST count method ('exact', 'planned' or 'estimated')
+    COUNT_METHOD = os.environ.get('COUNT_METHOD', 'exact')
+    COUNT_CACHE_TTL = float(os.environ.get('COUNT_CACHE_TTL', '15'))
+    
+    # Read-through entity caches (seconds / entries per entity)
+    CACHE_MAXSIZE = int(os.environ.get('CACHE_MAXSIZE', '2048'))
+    TEMPLATE_CACHE_TTL = float(os.environ.get('TEMPLATE_CACHE_TTL', '300'))
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '300'))
+    ORGANIZATION_CACHE_TTL = float(os.environ.get('ORGANIZATION_CACHE_TTL', '600'))
+    # How long the signed identity snapshot in the session is trusted
+    # before load_user re-reads the user. User changes revoke snapshots in
+    # every process through markers in IDENTITY_CHANGES_PATH, a local
+    # SQLite file (the job queue file by default); with web workers on
+    # several hosts, keep the TTL short, since other hosts only see a
+    # change once it expires
+    IDENTITY_SNAPSHOT_TTL = float(os.environ.get('IDENTITY_SNAPSHOT_TTL', '900'))
+    IDENTITY_CHANGES_PATH = os.environ.get('IDENTITY_CHANGES_PATH', os.environ.get('JOB_QUEUE_PATH', 'jobs.db'))
+    # Rendered invitation HTML by template type and parameters, bounded by
+    # memory; 0 disables it
+    RENDER_CACHE_MAX_BYTES = int(os.environ.get('RENDER_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+    # Stored template bodies by digest, one copy per unique body; 0 disables it
+    BODY_CACHE_MAX_BYTES = int(os.environ.get('BODY_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+    # Compression of stored template bodies: 'zlib' or 'none'
+    BODY_COMPRESSION = os.environ.get('BODY_COMPRESSION', 'zlib')
+    
+    # Logging: level for the 'smartmeeting' loggers, 'json' or 'text' lines,
+    # and optional sampling such as 'smartmeeting.email.send=0.1'. Request
+    # and send paths log nothing at INFO; per-message timings are DEBUG
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+    LOG_SAMPLING = os.environ.get('LOG_SAMPLING', '')
+    
+    # Demo-mode outbox: 'mbox' (batched appends, rotated), 'maildir' or 'none'
+    OUTBOX = os.environ.get('OUTBOX', 'mbox')
+    OUTBOX_PATH = os.environ.get('OUTBOX_PATH', 'outbox')
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', '100'))
+    OUTBOX_FLUSH_INTERVAL = float(os.environ.get('OUTBOX_FLUSH_INTERVAL', '1'))
+    OUTBOX_MAX_BYTES = int(os.environ.get('OUTBOX_MAX_BYTES', str(64 * 1024 * 1024)))
+    OUTBOX_BACKUPS = int(os.environ.get('OUTBOX_BACKUPS', '5'))
     
     # Gmail Integration
     GMAIL_USER = os.environ.get('GMAIL_USER', 'your-email@gmail.com')
     GMAIL_PASSWORD = os.environ.get('GMAIL_PASSWORD', 'your-app-password')
     
+    # Outgoing mail server and its connection pool (per worker process)
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', '587'))
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'true').lower() == 'true'
+    SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', '30'))
+    SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', '4'))
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+    SMTP_IDLE_TIMEOUT = float(os.environ.get('SMTP_IDLE_TIMEOUT', '60'))
+    # Transient failures are retried with exponential backoff; after
+    # SMTP_BREAKER_THRESHOLD consecutive failures sends fail fast for
+    # SMTP_BREAKER_RESET_TIMEOUT seconds before a trial send is let through
+    SMTP_RETRY_ATTEMPTS = int(os.environ.get('SMTP_RETRY_ATTEMPTS', '3'))
+    SMTP_RETRY_BASE_DELAY = float(os.environ.get('SMTP_RETRY_BASE_DELAY', '0.5'))
+    SMTP_RETRY_MAX_DELAY = float(os.environ.get('SMTP_RETRY_MAX_DELAY', '5'))
+    SMTP_BREAKER_THRESHOLD = int(os.environ.get('SMTP_BREAKER_THRESHOLD', '5'))
+    SMTP_BREAKER_RESET_TIMEOUT = float(os.environ.get('SMTP_BREAKER_RESET_TIMEOUT', '30'))
+    # Optionally deliver one distribution as a few multi-recipient
+    # transactions (grouped by domain, hidden recipients) instead of one
+    # transaction per recipient
+    SMTP_BATCH_RECIPIENTS = os.environ.get('SMTP_BATCH_RECIPIENTS', 'false').lower() == 'true'
+    SMTP_MAX_RECIPIENTS_PER_MESSAGE = int(os.environ.get('SMTP_MAX_RECIPIENTS_PER_MESSAGE', '50'))
+    
+    # Multi-recipient sends: parallel sends per worker and the provider quota
+    # (messages per second, with bursts up to SEND_RATE_BURST)
+    SEND_CONCURRENCY = int(os.environ.get('SEND_CONCURRENCY', '4'))
+    SEND_RATE_PER_SECOND = float(os.environ.get('SEND_RATE_PER_SECOND', '10'))
+    SEND_RATE_BURST = float(os.environ.get('SEND_RATE_BURST', '10'))
+    
+    # Background distribution jobs: SQLite queue shared by the processes on
+    # a host, sender threads per web process (0 = only `flask send-worker`)
+    JOB_QUEUE_PATH = os.environ.get('JOB_QUEUE_PATH', 'jobs.db')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1'))
+    JOB_STALE_AFTER = float(os.environ.get('JOB_STALE_AFTER', '300'))
+    
     # WhatsApp Integration
     WHATSAPP_API_KEY = os.environ.get('WHATSAPP_API_KEY', 'your-whatsapp-api-key')
     WHATSAPP_PHONE_NUMBER = os.environ.get('WHATSAPP_PHONE_NUMBER', 'your-whatsapp-phone-number')
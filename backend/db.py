@@ -1,11 +1,28 @@
-from utils.supabase_service import supabase_service
+import os
+from config import config
+from utils.cached_service import CachedSupabaseService
+
+app_config = config[os.environ.get('FLASK_ENV', 'production')]
+
+if app_config.STORAGE_BACKEND == 'sqlite':
+    from utils.sqlite_service import SQLiteService
+    storage_service = SQLiteService()
+else:
+    from utils.supabase_service import supabase_service as storage_service
+
+# All application reads go through the cache layer
+cached_supabase_service = CachedSupabaseService(storage_service)
 
 # Initialize Supabase service
 def init_db(app):
     """Initialize database with Flask app"""
     # Supabase is already initialized in supabase_service
-    return supabase_service
+    return cached_supabase_service
 
 def get_db():
     """Get database instance"""
-    return supabase_service 
\ No newline at end of file
+    return cached_supabase_service
+
+def init_worker():
+    """Open this worker's storage connections (call after fork)"""
+    storage_service.connect()
\ No newline at end of file
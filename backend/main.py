@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, session
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, send_file, redirect, url_for, flash, session
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
@@ -7,7 +7,11 @@ import json
 import datetime
 from datetime import datetime, timedelta
 import uuid
+import time
+import logging
 from dotenv import load_dotenv
+import click
+from flask.cli import with_appcontext
 
 # Load environment variables
 load_dotenv()
@@ -18,82 +22,141 @@ from db import init_db, get_db
 
 # Import utility functions
 from utils.validation import validate_email, validate_phone
-from utils.template_generator import template_generator
-from utils.email_service import send_gmail_invitation
+from utils.template_generator import template_generator, merge_values
+from utils.body_store import body_cache_stats
+from utils.email_service import send_gmail_invitation, send_gmail_batch, batch_recipients
+from utils.smtp_pool import smtp_pool_stats, smtp_breaker_stats
+from utils.fanout import get_fanout
+from utils.job_queue import get_job_queue, get_job_workers
+from utils.logging_setup import setup_logging
 from utils.whatsapp_service import send_whatsapp_message
-from utils.supabase_service import supabase_service
 
-app = Flask(__name__, template_folder='../frontend/templates', static_folder='static')
+logger = logging.getLogger('smartmeeting.app')
 
 # Load configuration
 config_name = os.environ.get('FLASK_ENV', 'production')
-app.config.from_object(config[config_name])
 
 # Template Configuration
-DEFAULT_TEMPLATE_TYPE = app.config['DEFAULT_TEMPLATE_TYPE']
+DEFAULT_TEMPLATE_TYPE = config[config_name].DEFAULT_TEMPLATE_TYPE
 
-# Ensure upload directory exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-# Initialize database
-db = init_db(app)
+# Initialize database (clients connect lazily, on first use)
+db = get_db()
 
 # Initialize models with database instance
 from utils.models import init_models
 User, Template, Distribution = init_models(db)
 
-# Initialize Supabase service and demo data
-with app.app_context():
+# Initialize login manager
+login_manager = LoginManager()
+login_manager.login_view = 'main.auth'
+
+bp = Blueprint('main', __name__)
+
+def create_app():
+    """Create and configure the Flask application
+    
+    Does no database work, so workers start serving immediately; run
+    `flask --app main bootstrap` once per deployment to set up the database.
+    """
+    started = time.perf_counter()
+    app = Flask(__name__, template_folder='../frontend/templates', static_folder='static')
+    app.config.from_object(config[config_name])
+    setup_logging(config[config_name])
+    
+    # Ensure upload directory exists
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    
+    init_db(app)
+    login_manager.init_app(app)
+    app.register_blueprint(bp)
+    app.cli.add_command(bootstrap_command)
+    app.cli.add_command(send_worker_command)
+    
+    app.extensions['startup_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"SmartMeetingAI app created in {app.extensions['startup_ms']} ms")
+    return app
+
+def bootstrap():
+    """Idempotent one-time setup: schema check, demo contacts and demo user"""
+    started = time.perf_counter()
+    
+    # Ensure database schema is up to date
+    db.ensure_database_schema()
+    
+    # Initialize demo contacts
+    db.initialize_demo_contacts()
+    print("Supabase connection and demo data initialized successfully!")
+    
+    # Create a demo user if none exists
+    demo_user_data = db.get_user_by_email('demo@example.com')
+    if not demo_user_data:
+        demo_user = db.create_user(
+            username='demo_user',
+            email='demo@example.com',
+            password_hash=generate_password_hash('demo123')
+        )
+        print("Demo user created: demo@example.com / demo123")
+    
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Bootstrap finished in {elapsed_ms:.1f} ms")
+    return elapsed_ms
+
+@click.command('bootstrap')
+@with_appcontext
+def bootstrap_command():
+    """Check the database schema and seed demo data"""
     try:
-        # Ensure database schema is up to date
-        db.ensure_database_schema()
-        
-        # Initialize demo contacts
-        db.initialize_demo_contacts()
-        print("Supabase connection and demo data initialized successfully!")
-        
-        # Create a demo user if none exists
-        demo_user_data = db.get_user_by_email('demo@example.com')
-        if not demo_user_data:
-            demo_user = db.create_user(
-                username='demo_user',
-                email='demo@example.com',
-                password_hash=generate_password_hash('demo123')
-            )
-            print("Demo user created: demo@example.com / demo123")
-            
+        bootstrap()
     except Exception as e:
         print(f"Database initialization warning: {e}")
-
-# Initialize login manager
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'auth'
+        raise SystemExit(1)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.get(user_id)
+    # Serve the signed snapshot from the session so authenticated requests
+    # don't pay a database round trip just to resolve the current user
+    snapshot = session.get('user_snapshot')
+    if snapshot and snapshot.get('id') == user_id and db.is_identity_fresh(user_id, snapshot.get('issued_at', 0)):
+        return User.from_snapshot(snapshot)
+    
+    user = User.get(user_id)
+    if user:
+        remember_identity(user)
+    else:
+        session.pop('user_snapshot', None)
+    return user
+
+def remember_identity(user):
+    """Store a signed identity snapshot in the session and warm the user cache"""
+    snapshot = user.to_snapshot()
+    db.prime_user({**snapshot, 'password_hash': 'hashed_password'})
+    session['user_snapshot'] = {**snapshot, 'issued_at': time.time()}
+
+def forget_identity(user_id):
+    """Drop the session snapshot and the cached user"""
+    session.pop('user_snapshot', None)
+    db.invalidate_user(user_id)
 
 # Routes
-@app.route('/favicon.ico')
+@bp.route('/favicon.ico')
 def favicon():
-    return app.send_static_file('favicon.ico')
+    return current_app.send_static_file('favicon.ico')
 
-@app.route('/apple-touch-icon.png')
+@bp.route('/apple-touch-icon.png')
 def apple_touch_icon():
-    return app.send_static_file('favicon.ico')
+    return current_app.send_static_file('favicon.ico')
 
-@app.route('/apple-touch-icon-precomposed.png')
+@bp.route('/apple-touch-icon-precomposed.png')
 def apple_touch_icon_precomposed():
-    return app.send_static_file('favicon.ico')
+    return current_app.send_static_file('favicon.ico')
 
-@app.route('/')
+@bp.route('/')
 @login_required
 def dashboard():
     # Redirect to template generator as the main page
-    return redirect(url_for('template_generator_page'))
+    return redirect(url_for('main.template_generator_page'))
 
-@app.route('/auth', methods=['GET', 'POST'])
+@bp.route('/auth', methods=['GET', 'POST'])
 def auth():
     if request.method == 'POST':
         data = request.get_json()
@@ -128,7 +191,8 @@ def auth():
                 )
             
             login_user(user)
-            return jsonify({'success': True, 'redirect': url_for('dashboard')})
+            remember_identity(user)
+            return jsonify({'success': True, 'redirect': url_for('main.dashboard')})
         
         elif action == 'register':
             email = data.get('email', 'demo@example.com')
@@ -159,27 +223,29 @@ def auth():
                 )
             
             login_user(user)
-            return jsonify({'success': True, 'redirect': url_for('dashboard')})
+            remember_identity(user)
+            return jsonify({'success': True, 'redirect': url_for('main.dashboard')})
     
     return render_template('auth.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 @login_required
 def logout():
+    forget_identity(current_user.id)
     logout_user()
-    return redirect(url_for('auth'))
+    return redirect(url_for('main.auth'))
 
-@app.route('/template-generator')
+@bp.route('/template-generator')
 @login_required
 def template_generator_page():
     return render_template('template_generator.html')
 
-@app.route('/api/templates/generate', methods=['POST'])
+@bp.route('/api/templates/generate', methods=['POST'])
 @login_required
 def generate_template():
     try:
         data = request.get_json()
-        print(f"Received data: {data}")  # Debug log
+        logger.debug("Template generation request fields: %s", sorted(data or {}))
         
         # Validate required fields
         required_fields = ['meetingTopic', 'speakerName', 'date', 'time', 'templateType']
@@ -187,7 +253,7 @@ def generate_template():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        print(f"Template type: {data['templateType']}")  # Debug log
+        logger.debug("Template type: %s", data['templateType'])
         
         # Generate template using predefined templates
         template_data = template_generator.generate_template(
@@ -204,7 +270,7 @@ def generate_template():
             priority=data.get('priority', 'Medium')
         )
         
-        print(f"Template data generated: {template_data['title']}")  # Debug log
+        logger.debug("Template data generated: %s", template_data['title'])
         
         # Save template to database using Supabase
         template_data_to_save = {
@@ -221,12 +287,14 @@ def generate_template():
             'attendees': json.dumps(template_data['attendees']) if isinstance(template_data['attendees'], list) else template_data['attendees'],
             'additional_notes': template_data['additional_notes'],
             'meeting_type': template_data['meeting_type'],
-            'priority': template_data['priority']
+            'priority': template_data['priority'],
+            'template_params': template_data['params'],
+            'template_version': template_data['template_version']
         }
         
         saved_template = db.create_template(**template_data_to_save)
         
-        print(f"Template saved with ID: {saved_template['id']}")  # Debug log
+        logger.debug("Template saved", extra={'template_id': saved_template['id'], 'template_type': data['templateType']})
         
         return jsonify({
             'success': True,
@@ -236,12 +304,10 @@ def generate_template():
         })
         
     except Exception as e:
-        print(f"Error in template generation: {str(e)}")  # Debug log
-        import traceback
-        traceback.print_exc()  # Print full stack trace
+        logger.exception("Error in template generation")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/templates/available', methods=['GET'])
+@bp.route('/api/templates/available', methods=['GET'])
 @login_required
 def get_available_templates():
     """Get list of available template types"""
@@ -254,13 +320,34 @@ def get_available_templates():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/distribution')
+@bp.route('/api/templates', methods=['GET'])
+@login_required
+def list_templates():
+    """List the current user's templates one keyset page at a time"""
+    try:
+        limit = min(int(request.args.get('limit', current_app.config['TEMPLATE_PAGE_SIZE'])), 100)
+        page = db.get_template_listing(
+            current_user.id,
+            after=request.args.get('after'),
+            limit=max(limit, 1)
+        )
+        return jsonify({
+            'success': True,
+            'templates': page['templates'],
+            'next_cursor': page['next_cursor']
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/distribution')
 @login_required
 def distribution():
-    templates = Template.query().filter_by(user_id=current_user.id).all()
-    return render_template('distribution.html', templates=templates)
+    page = db.get_template_listing(current_user.id, limit=current_app.config['TEMPLATE_PAGE_SIZE'])
+    return render_template('distribution.html', templates=page['templates'], next_cursor=page['next_cursor'])
 
-@app.route('/api/distribution/gmail', methods=['POST'])
+@bp.route('/api/distribution/gmail', methods=['POST'])
 @login_required
 def send_gmail():
     try:
@@ -269,6 +356,8 @@ def send_gmail():
         recipient_email = data.get('recipientEmail')  # Backward compatibility
         template_id = data.get('templateId')
         subject = data.get('subject', 'Meeting Invitation')
+        # Base of the per-recipient {{join_link}}; defaults to the template's link
+        meeting_link = data.get('meetingLink', '')
         
         # Handle both single email and multiple emails
         if recipient_email and not recipient_emails:
@@ -286,67 +375,127 @@ def send_gmail():
         if not template_data or template_data.get('user_id') != current_user.id:
             return jsonify({'error': 'Template not found'}), 404
         
-        # Send emails to all recipients
-        results = []
-        successful_sends = 0
+        # Sending happens on the job workers; the request returns right away
+        job_id = get_job_queue().enqueue('gmail', {
+            'template_id': template_id,
+            'recipient_emails': recipient_emails,
+            'subject': subject,
+            'meeting_link': meeting_link
+        }, user_id=current_user.id, total=len(recipient_emails))
         
-        for email in recipient_emails:
-            # Customize subject with meeting topic if available
-            meeting_topic = template_data.get('meeting_topic', '')
-            custom_subject = f"{subject}: {meeting_topic}" if meeting_topic else subject
-            
-            result = send_gmail_invitation(
-                email, 
-                template_data['content'], 
-                custom_subject,
-                app.config.get('GMAIL_USER'),
-                app.config.get('GMAIL_PASSWORD')
-            )
-            results.append({
+        return jsonify({
+            'success': True,
+            'message': f'Queued {len(recipient_emails)} invitation(s)',
+            'job_id': job_id,
+            'status_url': url_for('main.distribution_job', job_id=job_id)
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def run_gmail_job(job):
+    """Send a queued Gmail distribution; returns the job's final status and message"""
+    payload = job.payload
+    recipient_emails = payload['recipient_emails']
+    template_data = db.get_template(payload['template_id'])
+    if not template_data:
+        raise ValueError('Template not found')
+    
+    # Customize subject with meeting topic if available
+    subject = payload['subject']
+    meeting_topic = template_data.get('meeting_topic', '')
+    custom_subject = f"{subject}: {meeting_topic}" if meeting_topic else subject
+    app_config = config[config_name]
+    
+    # Templates with {{name}}/{{organization}}/{{join_link}} get a
+    # personalized copy per recipient, filled from the contact list
+    personalized = template_generator.merge_template(template_data['content']).personalized
+    meeting_link = payload.get('meeting_link') or template_data.get('meeting_link', '')
+    recipient_values = recipient_merge_values(recipient_emails, meeting_link) if personalized else {}
+    
+    def send_one(item):
+        position, email = item
+        # Never send once the job was handed to another worker
+        job.check()
+        result = send_gmail_invitation(
+            email, 
+            template_data['content'], 
+            custom_subject,
+            app_config.GMAIL_USER,
+            app_config.GMAIL_PASSWORD,
+            merge_values=recipient_values.get(email)
+        )
+        job.record(position, result['success'], {
+            'email': email,
+            'success': result['success'],
+            'message': result['message']
+        })
+    
+    def send_batch(batch):
+        job.check()
+        results = send_gmail_batch(
+            [email for _, email in batch],
+            template_data['content'],
+            custom_subject,
+            app_config.GMAIL_USER,
+            app_config.GMAIL_PASSWORD
+        )
+        for (position, email), result in zip(batch, results):
+            job.record(position, result['success'], {
                 'email': email,
                 'success': result['success'],
                 'message': result['message']
             })
-            
-            if result['success']:
-                successful_sends += 1
-        
-        # Save distribution record using Supabase
+    
+    # Send emails to all recipients concurrently, within the provider rate
+    # limit; recipients recorded before a worker restart are not resent
+    pending = [(position, email) for position, email in enumerate(recipient_emails) if position not in job.done]
+    if app_config.SMTP_BATCH_RECIPIENTS and len(pending) > 1 and not personalized:
+        # Same body for everyone: one transaction per domain batch
+        get_fanout('email').map(send_batch, batch_recipients(pending, app_config.SMTP_MAX_RECIPIENTS_PER_MESSAGE))
+    else:
+        get_fanout('email').map(send_one, pending)
+    successful_sends = get_job_queue().get(job.id)['sent']
+    
+    # Save distribution record using Supabase. A resumed job with nothing
+    # left to send stopped after its last send, possibly after saving it
+    if pending or not job.resumed:
+        job.check()
         recipients_json = json.dumps([{'email': email} for email in recipient_emails])
         db.create_distribution(
-            user_id=current_user.id,
-            template_id=template_id,
+            user_id=job.user_id,
+            template_id=payload['template_id'],
             method='gmail',
             recipients=recipient_emails,  # Pass as list
             status='sent' if successful_sends > 0 else 'failed',
             sent_at=datetime.utcnow().isoformat(),
             formatted_recipients=recipients_json  # Store formatted recipients
         )
-        
-        # Return summary
-        if successful_sends == len(recipient_emails):
-            return jsonify({
-                'success': True,
-                'message': f'Successfully sent {successful_sends} invitation(s)',
-                'details': results
-            })
-        elif successful_sends > 0:
-            return jsonify({
-                'success': True,
-                'message': f'Partially successful: {successful_sends}/{len(recipient_emails)} sent',
-                'details': results
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Failed to send any invitations',
-                'details': results
-            })
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    
+    # Return summary
+    if successful_sends == len(recipient_emails):
+        return 'completed', f'Successfully sent {successful_sends} invitation(s)'
+    elif successful_sends > 0:
+        return 'completed', f'Partially successful: {successful_sends}/{len(recipient_emails)} sent'
+    else:
+        return 'failed', 'Failed to send any invitations'
+
+def recipient_merge_values(recipient_emails, meeting_link):
+    """Merge field values per recipient email from contacts and their organizations"""
+    contacts = {contact['email'].lower(): contact for contact in db.get_contacts()}
+    organizations = {org['id']: org.get('name', '') for org in db.get_organizations()}
+    values = {}
+    for email in recipient_emails:
+        contact = contacts.get(email.lower(), {})
+        values[email] = merge_values(
+            email,
+            name=contact.get('name', ''),
+            organization=organizations.get(contact.get('organization_id'), ''),
+            meeting_link=meeting_link or ''
+        )
+    return values
 
-@app.route('/api/distribution/whatsapp', methods=['POST'])
+@bp.route('/api/distribution/whatsapp', methods=['POST'])
 @login_required
 def send_whatsapp():
     try:
@@ -364,32 +513,91 @@ def send_whatsapp():
         if not template_data or template_data.get('user_id') != current_user.id:
             return jsonify({'error': 'Template not found'}), 404
         
-        # Send WhatsApp message
-        result = send_whatsapp_message(phone_number, template_data['content'])
-        
-        # Save distribution record using Supabase
-        recipients_json = json.dumps([{'phone': phone_number}])
-        db.create_distribution(
-            user_id=current_user.id,
-            template_id=template_id,
-            method='whatsapp',
-            recipients=[phone_number],  # Pass as list
-            status='sent' if result['success'] else 'failed',
-            sent_at=datetime.utcnow().isoformat(),
-            formatted_recipients=recipients_json  # Store formatted recipients
-        )
+        job_id = get_job_queue().enqueue('whatsapp', {
+            'template_id': template_id,
+            'phone_number': phone_number
+        }, user_id=current_user.id, total=1)
         
         return jsonify({
-            'success': result['success'],
-            'message': result['message']
-        })
+            'success': True,
+            'message': 'Queued WhatsApp message',
+            'job_id': job_id,
+            'status_url': url_for('main.distribution_job', job_id=job_id)
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def run_whatsapp_job(job):
+    """Send a queued WhatsApp distribution; returns the job's final status and message"""
+    payload = job.payload
+    phone_number = payload['phone_number']
+    if job.resumed:
+        # Sent before the worker stopped; never send or save it twice
+        result = get_job_queue().get(job.id)['details'][0]
+        return ('completed' if result['success'] else 'failed'), result['message']
+    template_data = db.get_template(payload['template_id'])
+    if not template_data:
+        raise ValueError('Template not found')
+    
+    # Send WhatsApp message
+    job.check()
+    result = send_whatsapp_message(phone_number, template_data['content'])
+    job.record(0, result['success'], {
+        'phone': phone_number,
+        'success': result['success'],
+        'message': result['message']
+    })
+    
+    # Save distribution record using Supabase
+    recipients_json = json.dumps([{'phone': phone_number}])
+    db.create_distribution(
+        user_id=job.user_id,
+        template_id=payload['template_id'],
+        method='whatsapp',
+        recipients=[phone_number],  # Pass as list
+        status='sent' if result['success'] else 'failed',
+        sent_at=datetime.utcnow().isoformat(),
+        formatted_recipients=recipients_json  # Store formatted recipients
+    )
+    
+    return ('completed' if result['success'] else 'failed'), result['message']
 
+job_workers = get_job_workers()
+job_workers.register('gmail', run_gmail_job)
+job_workers.register('whatsapp', run_whatsapp_job)
 
-@app.route('/api/templates/<template_id>/download')
+@bp.before_app_request
+def start_job_workers():
+    # Started lazily so they run in each serving process, never in a
+    # preloading gunicorn master
+    job_workers.start()
+
+@bp.route('/api/distribution/jobs/<job_id>', methods=['GET'])
+@login_required
+def distribution_job(job_id):
+    """Progress and per-recipient outcomes of a queued distribution"""
+    job = get_job_queue().get(job_id)
+    if not job or job['user_id'] != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@click.command('send-worker')
+@click.option('--threads', type=int, default=None, help='Sender threads (default: JOB_WORKERS, at least 1)')
+@with_appcontext
+def send_worker_command(threads):
+    """Run distribution job workers in the foreground"""
+    job_workers.count = threads or max(job_workers.count, 1)
+    job_workers.start()
+    print(f"Sending distribution jobs with {job_workers.count} thread(s)")
+    while True:
+        time.sleep(3600)
+
+@bp.route('/api/templates/<template_id>/download')
 @login_required
 def download_template(template_id):
     """Download template as HTML file"""
@@ -491,12 +699,12 @@ def download_template(template_id):
 
 # New API endpoints for Module 1 database integration
 
-@app.route('/api/meetings', methods=['GET'])
+@bp.route('/api/meetings', methods=['GET'])
 @login_required
 def get_meetings():
     """Get all meetings from database"""
     try:
-        meetings = supabase_service.get_meetings()
+        meetings = db.get_meetings()
         return jsonify({
             'success': True,
             'meetings': meetings
@@ -504,12 +712,17 @@ def get_meetings():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/meetings/<meeting_id>', methods=['GET'])
+@bp.route('/api/meetings/<meeting_id>', methods=['GET'])
 @login_required
 def get_meeting(meeting_id):
     """Get specific meeting with attendees"""
     try:
-        meeting = supabase_service.get_meeting_with_attendees(meeting_id)
+        limit = request.args.get('limit', type=int)
+        meeting = db.get_meeting_with_attendees(
+            meeting_id,
+            after=request.args.get('after'),
+            limit=min(limit, 500) if limit else None
+        )
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
         
@@ -520,12 +733,12 @@ def get_meeting(meeting_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/meetings/upcoming', methods=['GET'])
+@bp.route('/api/meetings/upcoming', methods=['GET'])
 @login_required
 def get_upcoming_meetings():
     """Get upcoming meetings"""
     try:
-        meetings = supabase_service.get_upcoming_meetings()
+        meetings = db.get_upcoming_meetings()
         return jsonify({
             'success': True,
             'meetings': meetings
@@ -533,13 +746,13 @@ def get_upcoming_meetings():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/contacts', methods=['GET'])
+@bp.route('/api/contacts', methods=['GET'])
 @login_required
 def get_contacts():
     """Get all contacts from database"""
     try:
         member_type = request.args.get('member_type')  # 'internal' or 'external'
-        contacts = supabase_service.get_contacts(member_type)
+        contacts = db.get_contacts(member_type)
         return jsonify({
             'success': True,
             'contacts': contacts
@@ -547,12 +760,12 @@ def get_contacts():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/contacts/internal', methods=['GET'])
+@bp.route('/api/contacts/internal', methods=['GET'])
 @login_required
 def get_internal_members():
     """Get internal members only"""
     try:
-        contacts = supabase_service.get_internal_members()
+        contacts = db.get_internal_members()
         return jsonify({
             'success': True,
             'contacts': contacts
@@ -560,12 +773,12 @@ def get_internal_members():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/contacts/external', methods=['GET'])
+@bp.route('/api/contacts/external', methods=['GET'])
 @login_required
 def get_external_contacts():
     """Get external contacts only"""
     try:
-        contacts = supabase_service.get_external_contacts()
+        contacts = db.get_external_contacts()
         return jsonify({
             'success': True,
             'contacts': contacts
@@ -573,7 +786,7 @@ def get_external_contacts():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/contacts', methods=['POST'])
+@bp.route('/api/contacts', methods=['POST'])
 @login_required
 def add_contact():
     """Add a new contact"""
@@ -584,7 +797,7 @@ def add_contact():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        contact = supabase_service.add_contact(
+        contact = db.add_contact(
             email=data['email'],
             name=data['name'],
             member_type=data['member_type'],
@@ -603,12 +816,12 @@ def add_contact():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/organizations', methods=['GET'])
+@bp.route('/api/organizations', methods=['GET'])
 @login_required
 def get_organizations():
     """Get all organizations"""
     try:
-        organizations = supabase_service.get_organizations()
+        organizations = db.get_organizations()
         return jsonify({
             'success': True,
             'organizations': organizations
@@ -616,14 +829,60 @@ def get_organizations():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/health')
+@bp.route('/api/health')
 def health_check():
     return jsonify({
         'status': 'OK',
         'timestamp': datetime.utcnow().isoformat(),
         'version': '1.0.0',
-        'module': 'SmartMeetingAI Flask'
+        'module': 'SmartMeetingAI Flask',
+        'startup_ms': current_app.extensions.get('startup_ms')
+    })
+
+@bp.route('/api/health/cache')
+def cache_health():
+    """Entity, render and stored body cache hit/miss counters"""
+    return jsonify({
+        'status': 'OK',
+        'caches': db.cache_stats(),
+        'renders': template_generator.cache_stats(),
+        'bodies': body_cache_stats()
     })
 
+@bp.route('/api/health/pool')
+def pool_health():
+    """Supabase HTTP connection pool statistics for this worker"""
+    return jsonify({
+        'status': 'OK',
+        'pool': db.pool_stats()
+    })
+
+@bp.route('/api/health/storage')
+def storage_health():
+    """Per-method data access timings (sqlite backend only)"""
+    if not hasattr(db, 'storage_stats'):
+        return jsonify({'status': 'OK', 'storage': {'backend': 'supabase'}})
+    return jsonify({
+        'status': 'OK',
+        'storage': db.storage_stats()
+    })
+
+@bp.route('/api/health/smtp')
+def smtp_health():
+    """SMTP session pools and circuit breaker state for this worker"""
+    breakers = smtp_breaker_stats()
+    return jsonify({
+        'status': 'DEGRADED' if any(b['state'] != 'closed' for b in breakers) else 'OK',
+        'pools': smtp_pool_stats(),
+        'breakers': breakers
+    })
+
+app = create_app()
+
 if __name__ == '__main__':
+    with app.app_context():
+        try:
+            bootstrap()
+        except Exception as e:
+            print(f"Database initialization warning: {e}")
     app.run(debug=False, host='0.0.0.0', port=5001) 
\ No newline at end of file
@@ -8,12 +8,19 @@ import sys
 # Add the backend directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main import app
+from main import app, bootstrap
 
 if __name__ == '__main__':
     # Set production environment
     os.environ['FLASK_ENV'] = 'production'
     
+    # One-time database setup and demo data
+    with app.app_context():
+        try:
+            bootstrap()
+        except Exception as e:
+            print(f"Database initialization warning: {e}")
+    
     # Run the application
     print("Starting SmartMeetingAI in production mode...")
     print("Access the application at: http://localhost:5001")
@@ -0,0 +1,411 @@
+import asyncio
+from typing import List, Dict, Optional
+from datetime import datetime
+from postgrest import AsyncPostgrestClient
+from config import config
+from utils.cache import TTLCache
+from utils.http_pool import HTTPPool
+from utils.body_store import cached_bodies, remember_bodies
+from utils.supabase_service import (
+    _body_digests, _count_distributions_query, _count_templates_query, _created_templates, _distribution_record,
+    _distribution_recipients, _distributions_page, _distributions_query, _recipient_rows,
+    _recipients_page, _recipients_query, _template_from_meeting, _template_listing_page,
+    _template_listing_query, _template_meeting_rows, _template_minutes_rows, _template_payload,
+    _template_updates, _templates_query, _user_from_contact
+)
+import os
+import threading
+
+class AsyncSupabaseService:
+    """asyncio counterpart of SupabaseService
+
+    Same method surface for contacts, meetings, templates, distributions,
+    users and organizations, with every method a coroutine. Composite
+    operations issue their independent queries concurrently with
+    asyncio.gather, so a single worker can keep many requests in flight.
+    """
+
+    def __init__(self):
+        config_name = os.environ.get('FLASK_ENV', 'production')
+        app_config = config[config_name]
+        self.app_config = app_config
+
+        # httpx async clients belong to the event loop they were created on,
+        # so there is one per loop
+        self._clients: Dict[asyncio.AbstractEventLoop, AsyncPostgrestClient] = {}
+        self._clients_lock = threading.Lock()
+        self.http_pool = HTTPPool(app_config)
+
+        self.count_method = app_config.COUNT_METHOD
+        self._count_cache = TTLCache(maxsize=1024, ttl=app_config.COUNT_CACHE_TTL)
+
+    @property
+    def postgrest(self) -> AsyncPostgrestClient:
+        """The PostgREST client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            with self._clients_lock:
+                # Loops that finished without aclose() leave their client behind
+                for closed in [other for other in self._clients if other.is_closed()]:
+                    self.http_pool.discard_async_client(self._clients.pop(closed))
+                key = self.app_config.SUPABASE_ANON_KEY
+                client = self._clients[loop] = self.http_pool.create_async_postgrest_client(
+                    f"{self.app_config.SUPABASE_URL}/rest/v1",
+                    headers={'apiKey': key, 'Authorization': f'Bearer {key}'}
+                )
+        return client
+
+    def table(self, name: str):
+        return self.postgrest.from_(name)
+
+    async def aclose(self):
+        """Close the pooled connections of the current event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # Contact Management
+    async def get_contacts(self, member_type: Optional[str] = None) -> List[Dict]:
+        """Get all contacts, optionally filtered by member type"""
+        query = self.table('contacts').select('*')
+
+        if member_type:
+            query = query.eq('member_type', member_type)
+
+        response = await query.execute()
+        return response.data if response.data else []
+
+    async def get_internal_members(self) -> List[Dict]:
+        """Get all internal members"""
+        return await self.get_contacts('internal')
+
+    async def get_external_contacts(self) -> List[Dict]:
+        """Get all external contacts"""
+        return await self.get_contacts('external')
+
+    async def add_contact(self, email: str, name: str, member_type: str = 'external',
+                          organization_id: Optional[str] = None) -> Dict:
+        """Add a new contact"""
+        contact_data = {
+            'email': email,
+            'name': name,
+            'member_type': member_type,
+            'organization_id': organization_id
+        }
+
+        response = await self.table('contacts').insert(contact_data).execute()
+        return response.data[0] if response.data else None
+
+    async def update_contact(self, contact_id: str, **kwargs) -> Dict:
+        """Update a contact"""
+        response = await self.table('contacts').update(kwargs).eq('id', contact_id).execute()
+        return response.data[0] if response.data else None
+
+    async def delete_contact(self, contact_id: str) -> bool:
+        """Delete a contact"""
+        response = await self.table('contacts').delete().eq('id', contact_id).execute()
+        return len(response.data) > 0 if response.data else False
+
+    # Meeting Management
+    async def get_meetings(self, organization_id: Optional[str] = None) -> List[Dict]:
+        """Get all meetings, optionally filtered by organization"""
+        query = self.table('meetings').select('*')
+
+        if organization_id:
+            query = query.eq('organization_id', organization_id)
+
+        response = await query.execute()
+        return response.data if response.data else []
+
+    async def get_meeting(self, meeting_id: str) -> Optional[Dict]:
+        """Get a specific meeting"""
+        response = await self.table('meetings').select('*').eq('id', meeting_id).execute()
+        return response.data[0] if response.data else None
+
+    async def get_meeting_with_attendees(self, meeting_id: str, after: Optional[str] = None,
+                                         limit: Optional[int] = None) -> Optional[Dict]:
+        """Get meeting details with one keyset page of attendees, fetched concurrently"""
+        meeting, page = await asyncio.gather(
+            self.get_meeting(meeting_id),
+            self.get_meeting_recipients(meeting_id, after=after, limit=limit)
+        )
+        if not meeting:
+            return None
+
+        meeting['attendees'] = page['recipients']
+        meeting['attendees_next_cursor'] = page['next_cursor']
+        return meeting
+
+    async def get_meeting_recipients(self, meeting_id: str, after: Optional[str] = None,
+                                     limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of a meeting's unique recipients, newest first"""
+        response = await _recipients_query(self.table('meeting_recipients'), meeting_id, after, limit).execute()
+        return _recipients_page(response.data or [], limit)
+
+    async def add_meeting_recipients(self, meeting_id: str, recipients: List[Dict]) -> None:
+        """Record recipients of a meeting with set semantics"""
+        rows = _recipient_rows(meeting_id, recipients)
+        if rows:
+            await self.table('meeting_recipients').upsert(
+                rows,
+                on_conflict='meeting_id,recipient_key',
+                ignore_duplicates=True,
+                returning='minimal'
+            ).execute()
+
+    async def get_upcoming_meetings(self, organization_id: Optional[str] = None) -> List[Dict]:
+        """Get upcoming meetings"""
+        query = self.table('meetings').select('*').gte('scheduled_at', datetime.utcnow().isoformat())
+
+        if organization_id:
+            query = query.eq('organization_id', organization_id)
+
+        response = await query.order('scheduled_at').execute()
+        return response.data if response.data else []
+
+    async def create_meeting(self, organization_id: str, meeting_code: str, title: str,
+                             scheduled_at: str, duration_mins: int = 30, description: str = None) -> Dict:
+        """Create a new meeting"""
+        meeting_data = {
+            'organization_id': organization_id,
+            'meeting_code': meeting_code,
+            'title': title,
+            'scheduled_at': scheduled_at,
+            'duration_mins': duration_mins,
+            'description': description
+        }
+
+        response = await self.table('meetings').insert(meeting_data).execute()
+        return response.data[0] if response.data else None
+
+    async def update_meeting(self, meeting_id: str, **kwargs) -> Dict:
+        """Update a meeting"""
+        response = await self.table('meetings').update(kwargs).eq('id', meeting_id).execute()
+        return response.data[0] if response.data else None
+
+    async def delete_meeting(self, meeting_id: str) -> bool:
+        """Delete a meeting"""
+        response = await self.table('meetings').delete().eq('id', meeting_id).execute()
+        return len(response.data) > 0 if response.data else False
+
+    # Template Management (mapped to meetings and meeting_minutes)
+    async def create_template(self, user_id: str, title: str, content: str, **kwargs) -> Dict:
+        """Create a new template (stored as meeting with minutes)"""
+        created = await self.create_templates([dict(kwargs, user_id=user_id, title=title, content=content)])
+        return created[0] if created else None
+
+    async def create_templates(self, templates: List[Dict]) -> List[Dict]:
+        """Create several templates in one atomic round trip (see SupabaseService.create_templates)"""
+        if not templates:
+            return []
+
+        payload = _template_payload(templates)
+        try:
+            response = await self.postgrest.rpc('create_templates', {'templates': payload}).execute()
+            rows = response.data or []
+        except Exception as e:
+            if 'create_templates' in str(e) and ('PGRST202' in str(e) or 'Could not find the function' in str(e)):
+                print("Warning: create_templates function does not exist. Please run SUPABASE_MIGRATION.md.")
+                rows = await self._create_templates_fallback(payload)
+            else:
+                raise
+
+        self._count_cache.clear()
+        return _created_templates(rows, templates)
+
+    async def _create_templates_fallback(self, payload: List[Dict]) -> List[Dict]:
+        """Two batched inserts for databases without the create_templates function
+
+        Not atomic, so the meetings are deleted again if the minutes insert fails.
+        """
+        bodies = list({item['body']['digest']: item['body'] for item in payload if item['body']}.values())
+        if bodies:
+            await self.table('template_bodies').upsert(bodies, on_conflict='digest', ignore_duplicates=True).execute()
+
+        meeting_response = await self.table('meetings').insert(_template_meeting_rows(payload)).execute()
+        meetings = meeting_response.data or []
+
+        minutes_data = _template_minutes_rows(meetings, payload)
+        try:
+            if minutes_data:
+                await self.table('meeting_minutes').insert(minutes_data).execute()
+        except Exception:
+            await self.table('meetings').delete().in_('id', [m['id'] for m in meetings]).execute()
+            raise
+
+        return [{'id': meeting['id']} for meeting in meetings]
+
+    async def _bodies(self, meetings: List[Dict]) -> Dict[str, str]:
+        """Stored bodies of the templates in meetings; only uncached ones are fetched"""
+        bodies, missing = cached_bodies(_body_digests(meetings))
+        if missing:
+            response = await self.table('template_bodies').select('digest, body, encoding').in_('digest', missing).execute()
+            bodies.update(remember_bodies(response.data or []))
+        return bodies
+
+    async def get_templates(self, user_id: Optional[str] = None) -> List[Dict]:
+        """Get templates (meetings with is_template=True)"""
+        response = await _templates_query(self.table('meetings'), user_id).execute()
+        meetings = response.data or []
+        bodies = await self._bodies(meetings)
+        templates = [_template_from_meeting(meeting, bodies) for meeting in meetings]
+        return [template for template in templates if template]
+
+    async def get_template_listing(self, user_id: str, after: Optional[str] = None,
+                                   limit: int = 20) -> Dict:
+        """Get one keyset page of a user's templates, newest first, without full_mom"""
+        response = await _template_listing_query(self.table('meetings'), user_id, after, limit).execute()
+        return _template_listing_page(response.data or [], user_id, limit)
+
+    async def count_templates(self, user_id: Optional[str] = None) -> int:
+        """Count templates server-side, cached briefly per user"""
+        key = ('templates', user_id)
+        count = self._count_cache.get(key)
+        if count is None:
+            response = await _count_templates_query(self.table('meetings'), user_id, self.count_method).execute()
+            count = response.count or 0
+            self._count_cache.set(key, count)
+        return count
+
+    async def get_template(self, template_id: str) -> Optional[Dict]:
+        """Get a specific template"""
+        response = await self.table('meetings').select('*, meeting_minutes(*)').eq('id', template_id).eq('is_template', True).execute()
+        if not response.data:
+            return None
+        return _template_from_meeting(response.data[0], await self._bodies(response.data))
+
+    async def update_template(self, template_id: str, **kwargs) -> Dict:
+        """Update a template; the meeting and minutes updates run concurrently"""
+        meeting_updates, minutes_updates, body = _template_updates(kwargs)
+
+        updates = []
+        if body:
+            # Stores the body and references it in one transaction that keeps
+            # a concurrent delete from collecting it (see SupabaseService)
+            updates.append(self.postgrest.rpc('set_template_body', {'template_id': template_id, 'new_body': body}).execute())
+            minutes_updates = {k: v for k, v in minutes_updates.items() if k not in ('full_mom', 'body_digest')}
+        if meeting_updates:
+            updates.append(self.table('meetings').update(meeting_updates).eq('id', template_id).execute())
+        if minutes_updates:
+            updates.append(self.table('meeting_minutes').update(minutes_updates).eq('meeting_id', template_id).execute())
+        await asyncio.gather(*updates)
+
+        return await self.get_template(template_id)
+
+    async def delete_template(self, template_id: str) -> bool:
+        """Delete a template"""
+        # Delete meeting minutes first; their trigger deletes a stored body
+        # with its last reference
+        await self.table('meeting_minutes').delete().eq('meeting_id', template_id).execute()
+        # Delete meeting
+        response = await self.table('meetings').delete().eq('id', template_id).execute()
+        self._count_cache.clear()
+        return len(response.data) > 0 if response.data else False
+
+    # Distribution Management
+    async def create_distribution(self, user_id: str, template_id: str, method: str,
+                                  recipients: List[str], **kwargs) -> Dict:
+        """Create a new distribution record, then store its recipients"""
+        post = await self.table('social_posts').insert(_distribution_record(template_id, method, kwargs)).execute()
+        self._count_cache.clear()
+        if not post.data:
+            return None
+        # Only after the insert succeeded, as in the sync service
+        await self._store_recipients(template_id, kwargs)
+        return post.data[0]
+
+    async def _store_recipients(self, template_id: str, kwargs: Dict) -> None:
+        try:
+            recipients_list = _distribution_recipients(kwargs)
+            if recipients_list:
+                await self.add_meeting_recipients(template_id, recipients_list)
+        except Exception as e:
+            print(f"Error storing recipients: {e}")
+
+    async def get_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                                method: Optional[str] = None, after: Optional[str] = None,
+                                limit: Optional[int] = None) -> List[Dict]:
+        """Get distributions with recipients, newest first"""
+        page = await self.get_distributions_page(user_id, status=status, method=method,
+                                                 after=after, limit=limit)
+        return page['distributions']
+
+    async def get_distributions_page(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                                     method: Optional[str] = None, after: Optional[str] = None,
+                                     limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of distributions (a single embedded select)"""
+        query = _distributions_query(self.table('social_posts'), user_id, status, method, after, limit)
+        response = await query.execute()
+        return _distributions_page(response.data or [], limit)
+
+    async def count_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                                  method: Optional[str] = None) -> int:
+        """Count distributions server-side, cached briefly per filter set"""
+        key = ('distributions', user_id, status, method)
+        count = self._count_cache.get(key)
+        if count is None:
+            query = _count_distributions_query(self.table('social_posts'), user_id, status,
+                                               method, self.count_method)
+            count = (await query.execute()).count or 0
+            self._count_cache.set(key, count)
+        return count
+
+    async def update_distribution_status(self, distribution_id: str, status: str, **kwargs) -> Dict:
+        """Update distribution status"""
+        update_data = {'status': status}
+        if status == 'sent':
+            update_data['published_at'] = datetime.utcnow().isoformat()
+
+        response = await self.table('social_posts').update(update_data).eq('id', distribution_id).execute()
+        self._count_cache.clear()
+        return response.data[0] if response.data else None
+
+    # User Management (mapped to contacts)
+    async def create_user(self, username: str, email: str, password_hash: str) -> Dict:
+        """Create a new user (stored as contact)"""
+        user_data = {
+            'email': email,
+            'name': username,
+            'member_type': 'internal',
+            'status': 'active'
+        }
+
+        response = await self.table('contacts').insert(user_data).execute()
+        return response.data[0] if response.data else None
+
+    async def get_user_by_email(self, email: str) -> Optional[Dict]:
+        """Get user by email"""
+        response = await self.table('contacts').select('*').eq('email', email).execute()
+        return _user_from_contact(response.data[0]) if response.data else None
+
+    async def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Get user by username (name in contacts)"""
+        response = await self.table('contacts').select('*').eq('name', username).execute()
+        return _user_from_contact(response.data[0]) if response.data else None
+
+    async def get_user(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        response = await self.table('contacts').select('*').eq('id', user_id).execute()
+        return _user_from_contact(response.data[0]) if response.data else None
+
+    # Organization Management
+    async def get_organizations(self) -> List[Dict]:
+        """Get all organizations"""
+        response = await self.table('organizations').select('*').execute()
+        return response.data if response.data else []
+
+    async def get_organization(self, organization_id: str) -> Optional[Dict]:
+        """Get a specific organization"""
+        response = await self.table('organizations').select('*').eq('id', organization_id).execute()
+        return response.data[0] if response.data else None
+
+    async def create_organization(self, name: str, domain: str = None) -> Dict:
+        """Create a new organization"""
+        org_data = {
+            'name': name,
+            'domain': domain
+        }
+
+        response = await self.table('organizations').insert(org_data).execute()
+        return response.data[0] if response.data else None
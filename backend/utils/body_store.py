@@ -0,0 +1,70 @@
+import base64
+import hashlib
+import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import config
+from utils.cache import SizedLRUCache
+
+# Rendered template bodies are stored once per content in template_bodies,
+# keyed by their SHA-256 digest; meeting_minutes.body_digest references them
+# and triggers keep template_bodies.refcount, deleting a body with its last
+# reference. Bodies never change under a digest, so cached copies never go
+# stale and every template with the same body shares one string.
+
+ENCODINGS = ('identity', 'zlib')
+
+def body_digest(body: str) -> str:
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+def body_row(body: str, compression: Optional[str] = None) -> Dict:
+    """The template_bodies row for body; zlib data is kept only if smaller
+
+    Compressed bodies are base64 text so that both backends store them in
+    a text column.
+    """
+    compression = compression or _app_config().BODY_COMPRESSION
+    raw = body.encode('utf-8')
+    data, encoding = body, 'identity'
+    if compression == 'zlib':
+        packed = base64.b64encode(zlib.compress(raw)).decode('ascii')
+        if len(packed) < len(raw):
+            data, encoding = packed, 'zlib'
+    return {'digest': hashlib.sha256(raw).hexdigest(), 'body': data, 'encoding': encoding, 'size': len(raw)}
+
+def decode_body(row: Dict) -> str:
+    if row['encoding'] == 'zlib':
+        return zlib.decompress(base64.b64decode(row['body'])).decode('utf-8')
+    if row['encoding'] != 'identity':
+        raise ValueError(f"Unknown body encoding: {row['encoding']}")
+    return row['body']
+
+def _app_config():
+    return config[os.environ.get('FLASK_ENV', 'production')]
+
+_cache_bytes = _app_config().BODY_CACHE_MAX_BYTES
+body_cache = SizedLRUCache(_cache_bytes) if _cache_bytes > 0 else None
+
+def cached_bodies(digests: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Bodies already held in this process, and the digests still to fetch"""
+    bodies, missing = {}, []
+    for digest in dict.fromkeys(digests):
+        body = body_cache.get(digest) if body_cache is not None else None
+        if body is None:
+            missing.append(digest)
+        else:
+            bodies[digest] = body
+    return bodies, missing
+
+def remember_bodies(rows: Iterable[Dict]) -> Dict[str, str]:
+    """Decode fetched template_bodies rows and keep them for later reads"""
+    bodies = {}
+    for row in rows:
+        body = bodies[row['digest']] = decode_body(row)
+        if body_cache is not None:
+            body_cache.set(row['digest'], body)
+    return bodies
+
+def body_cache_stats() -> Dict:
+    return body_cache.stats() if body_cache is not None else {'enabled': False}
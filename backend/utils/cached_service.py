@@ -0,0 +1,143 @@
+from typing import List, Dict, Optional, Any
+from config import config
+from utils.cache import TTLCache
+from utils.user_changes import UserChanges
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger('smartmeeting.cache')
+
+class CachedSupabaseService:
+    """Read-through cache in front of SupabaseService
+
+    Templates, users and organizations are served from bounded per-entity
+    LRU caches; every mutator that can change one of them invalidates the
+    affected entries before returning. Anything not overridden here is
+    delegated to the wrapped service unchanged.
+    """
+
+    def __init__(self, service):
+        config_name = os.environ.get('FLASK_ENV', 'production')
+        app_config = config[config_name]
+
+        self.service = service
+        self.templates = TTLCache(maxsize=app_config.CACHE_MAXSIZE, ttl=app_config.TEMPLATE_CACHE_TTL)
+        self.users = TTLCache(maxsize=app_config.CACHE_MAXSIZE, ttl=app_config.USER_CACHE_TTL)
+        self.organizations = TTLCache(maxsize=app_config.CACHE_MAXSIZE, ttl=app_config.ORGANIZATION_CACHE_TTL)
+        # When each user was last changed, in a file every worker on the
+        # host reads, so session identity snapshots taken before the change
+        # are rejected by all of them
+        self.identity_ttl = app_config.IDENTITY_SNAPSHOT_TTL
+        self.user_changes = UserChanges(app_config.IDENTITY_CHANGES_PATH, keep_for=self.identity_ttl)
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters for every entity cache"""
+        return {
+            'templates': self.templates.stats(),
+            'users': self.users.stats(),
+            'organizations': self.organizations.stats()
+        }
+
+    # Templates
+    def get_template(self, template_id: str) -> Optional[Dict]:
+        """Get a specific template"""
+        template = self.templates.get_or_load(template_id, lambda: self.service.get_template(template_id))
+        return dict(template) if template else None
+
+    def update_template(self, template_id: str, **kwargs) -> Dict:
+        """Update a template"""
+        try:
+            return self.service.update_template(template_id, **kwargs)
+        finally:
+            self.templates.pop(template_id)
+
+    def delete_template(self, template_id: str) -> bool:
+        """Delete a template"""
+        try:
+            return self.service.delete_template(template_id)
+        finally:
+            self.templates.pop(template_id)
+
+    # Templates are stored as meetings, so meeting writes invalidate them too
+    def update_meeting(self, meeting_id: str, **kwargs) -> Dict:
+        """Update a meeting"""
+        try:
+            return self.service.update_meeting(meeting_id, **kwargs)
+        finally:
+            self.templates.pop(meeting_id)
+
+    def delete_meeting(self, meeting_id: str) -> bool:
+        """Delete a meeting"""
+        try:
+            return self.service.delete_meeting(meeting_id)
+        finally:
+            self.templates.pop(meeting_id)
+
+    # Users (stored as contacts)
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        user = self.users.get_or_load(user_id, lambda: self.service.get_user(user_id))
+        return dict(user) if user else None
+
+    def prime_user(self, user: Dict) -> None:
+        """Seed the user cache with a row the caller already holds"""
+        self.users.set(user['id'], dict(user))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Forget a cached user and any identity snapshot issued before now"""
+        self.users.pop(user_id)
+        try:
+            self.user_changes.mark(user_id)
+        except sqlite3.Error as e:
+            logger.warning("Could not record the change of user %s for other workers: %s", user_id, e)
+
+    def is_identity_fresh(self, user_id: str, issued_at: float) -> bool:
+        """Whether an identity snapshot issued at issued_at may still be trusted"""
+        if time.time() - issued_at > self.identity_ttl:
+            return False
+        try:
+            changed_at = self.user_changes.changed_at(user_id)
+        except sqlite3.Error as e:
+            # Unknown, so re-read the user
+            logger.warning("Could not read user changes: %s", e)
+            return False
+        return changed_at is None or changed_at < issued_at
+
+    def update_contact(self, contact_id: str, **kwargs) -> Dict:
+        """Update a contact"""
+        try:
+            return self.service.update_contact(contact_id, **kwargs)
+        finally:
+            self.invalidate_user(contact_id)
+
+    def delete_contact(self, contact_id: str) -> bool:
+        """Delete a contact"""
+        try:
+            return self.service.delete_contact(contact_id)
+        finally:
+            self.invalidate_user(contact_id)
+
+    # Organizations
+    def get_organizations(self) -> List[Dict]:
+        """Get all organizations"""
+        organizations = self.organizations.get_or_load('__all__', self.service.get_organizations)
+        return [dict(org) for org in organizations] if organizations else []
+
+    def get_organization(self, organization_id: str) -> Optional[Dict]:
+        """Get a specific organization"""
+        organization = self.organizations.get_or_load(
+            organization_id, lambda: self.service.get_organization(organization_id)
+        )
+        return dict(organization) if organization else None
+
+    def create_organization(self, name: str, domain: str = None) -> Dict:
+        """Create a new organization"""
+        try:
+            return self.service.create_organization(name, domain)
+        finally:
+            self.organizations.pop('__all__')
@@ -1,19 +1,25 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
+from email.policy import compat32
+from email.charset import Charset, QP
+from email import quoprimime
+import logging
 import re
+import smtplib
+import time
+from utils.cache import TTLCache
+from utils.outbox import get_outbox
+from utils.smtp_pool import get_smtp_pool
+from utils.template_generator import template_generator
 
-def send_gmail_invitation(recipient_email, template_content, subject="Meeting Invitation", gmail_user=None, gmail_password=None):
-    """Send Gmail invitation using Gmail API or SMTP fallback"""
-    try:
-        # Debug: Print the content type we're about to send
-        print(f"DEBUG: Sending email to {recipient_email}")
-        print(f"DEBUG: Template content length: {len(template_content)} characters")
-        print(f"DEBUG: Template starts with: {template_content[:100]}...")
-        
-        # Create HTML version with proper DOCTYPE and meta tags
-        html_content = f"""<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+logger = logging.getLogger('smartmeeting.email')
+# One DEBUG line per message with timings; sample it with LOG_SAMPLING
+send_logger = logging.getLogger('smartmeeting.email.send')
+
+def _wrap_html(template_content, subject):
+    """Create HTML version with proper DOCTYPE and meta tags"""
+    return f"""<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
 <html xmlns="http://www.w3.org/1999/xhtml">
 <head>
     <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
@@ -24,67 +30,249 @@ def send_gmail_invitation(recipient_email, template_content, subject="Meeting In
     {template_content}
 </body>
 </html>"""
+
+class PreparedMessage:
+    """An invitation rendered and MIME-encoded once, then addressed per recipient
+
+    The wire bytes are split around the To header, so a message for one
+    more recipient costs a header fold and a concatenation instead of
+    rebuilding and re-encoding the whole body.
+    """
+    
+    def __init__(self, template_content, subject, sender):
+        self.subject = subject
+        self.sender = sender
+        self.html = _wrap_html(template_content, subject)
         
-        # Try HTML-only message first
-        msg = MIMEText(html_content, 'html', 'utf-8')
+        # HTML-only message, headers in the order they have always been sent
+        msg = MIMEText(self.html, 'html', 'utf-8')
         msg['Subject'] = subject
-        msg['From'] = gmail_user or 'noreply@smartmeeting.ai'
-        msg['To'] = recipient_email
-        msg['Content-Type'] = 'text/html; charset=utf-8'
+        msg['From'] = sender
+        headers, body = msg.as_string().split('\n\n', 1)
+        tail = compat32.fold('Content-Type', 'text/html; charset=utf-8') + '\n' + body
+        self._head = _wire(headers + '\n')
+        self._tail = _wire(tail)
+    
+    def for_recipient(self, recipient_email, merge_values=None):
+        """The complete message for one recipient, CRLF-terminated and ready for sendmail"""
+        return self._head + _wire(compat32.fold('To', recipient_email)) + self._tail
+    
+    def for_batch(self):
+        """One message for a multi-recipient transaction; addresses only go in the envelope"""
+        return self._head + _wire(compat32.fold('To', 'undisclosed-recipients:;')) + self._tail
+
+class PersonalizedMessage:
+    """An invitation with per-recipient merge fields, encoded once in segments
+    
+    The body is sent quoted-printable. Every invariant segment is encoded
+    up front; a recipient's message joins those with the encoded merge
+    values using soft line breaks, so the cost per recipient is the
+    substituted bytes plus the concatenation.
+    """
+    
+    def __init__(self, template_content, subject, sender):
+        self.subject = subject
+        self.sender = sender
+        self.html = _wrap_html(template_content, subject)
+        self.merge = template_generator.merge_template(self.html)
         
-        print(f"DEBUG: Gmail user: {gmail_user}")
-        print(f"DEBUG: Gmail password configured: {'Yes' if gmail_password else 'No'}")
+        charset = Charset('utf-8')
+        charset.body_encoding = QP
+        msg = MIMEText('', 'html', charset)
+        msg['Subject'] = subject
+        msg['From'] = sender
+        headers = msg.as_string().split('\n\n', 1)[0]
+        self._head = _wire(headers + '\n')
+        self._headers_tail = _wire(compat32.fold('Content-Type', 'text/html; charset=utf-8') + '\n')
+        self._segments = [_qp(segment) for segment in self.merge.segments]
+    
+    def for_recipient(self, recipient_email, merge_values=None):
+        """The complete message for one recipient, with merge_values filled in"""
+        body = self.merge.render(merge_values or {}, self._segments, _qp, _join_qp)
+        return self._head + _wire(compat32.fold('To', recipient_email)) + self._headers_tail + body
+
+def _qp(text):
+    # 75 leaves room for the soft break added when segments are joined
+    return quoprimime.body_encode(text.encode('utf-8').decode('latin-1'), maxlinelen=75, eol='\r\n').encode('ascii')
+
+def _join_qp(chunks):
+    """Concatenate quoted-printable chunks, ending unfinished lines with a soft break"""
+    body = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if body and not body[-1].endswith(b'\r\n'):
+            body.append(b'=\r\n')
+        body.append(chunk)
+    return b''.join(body)
+
+def _wire(text):
+    return text.replace('\n', '\r\n').encode('ascii')
+
+# A distribution sends the same template to every recipient
+_prepared_messages = TTLCache(maxsize=64, ttl=600)
+
+def prepare_message(template_content, subject, sender):
+    """Shared PreparedMessage (or PersonalizedMessage) for a (template, subject, sender) combination"""
+    key = (template_content, subject, sender)
+    return _prepared_messages.get_or_load(key, lambda: _prepare(template_content, subject, sender))
+
+def _prepare(template_content, subject, sender):
+    if template_generator.merge_template(template_content).personalized:
+        return PersonalizedMessage(template_content, subject, sender)
+    return PreparedMessage(template_content, subject, sender)
+
+def _has_credentials(gmail_user, gmail_password):
+    return bool(gmail_user and gmail_password and gmail_user != 'your-email@gmail.com' and gmail_password != 'your-app-password')
+
+def batch_recipients(recipients, max_per_batch):
+    """Group (position, email) pairs by domain into batches of at most max_per_batch
+
+    Recipients at one domain are usually handled by the same receiving
+    server, so a batch maps to one transaction there after relaying.
+    """
+    by_domain = {}
+    for position, email in recipients:
+        by_domain.setdefault(email.rpartition('@')[2].lower(), []).append((position, email))
+    batches = []
+    for group in by_domain.values():
+        for start in range(0, len(group), max_per_batch):
+            batches.append(group[start:start + max_per_batch])
+    return batches
+
+def send_gmail_invitation(recipient_email, template_content, subject="Meeting Invitation", gmail_user=None, gmail_password=None, merge_values=None):
+    """Send Gmail invitation using Gmail API or SMTP fallback
+    
+    merge_values fills the recipient's {{name}}, {{organization}} and
+    {{join_link}} fields when the template has any.
+    """
+    started = time.perf_counter()
+    mode = 'demo'
+    size = 0
+    prepare_ms = send_ms = 0.0
+    result = None
+    try:
+        logger.debug("Sending email to %s (template %d characters)", recipient_email, len(template_content))
+        
+        prepared = prepare_message(template_content, subject, gmail_user or 'noreply@smartmeeting.ai')
+        html_content = prepared.html
+        prepare_ms = (time.perf_counter() - started) * 1000
         
         # Try Gmail API first, fallback to SMTP
-        if gmail_user and gmail_password and gmail_user != 'your-email@gmail.com' and gmail_password != 'your-app-password':
+        if _has_credentials(gmail_user, gmail_password):
             # Use SMTP with app password
+            mode = 'smtp'
             try:
-                print("DEBUG: Attempting SMTP connection...")
-                server = smtplib.SMTP('smtp.gmail.com', 587)
-                server.starttls()
-                server.login(gmail_user, gmail_password)
-                
-                # Convert message to string and send
-                text = msg.as_string()
-                print(f"DEBUG: Email message size: {len(text)} bytes")
-                print(f"DEBUG: Email headers preview:")
-                header_lines = text.split('\n')[:10]
-                for line in header_lines:
-                    print(f"DEBUG:   {line}")
+                # Address the shared, already encoded message and send
+                message = prepared.for_recipient(recipient_email, merge_values)
+                size = len(message)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Email headers: %s", message[:2048].decode('ascii').split('\r\n')[:10])
                 
-                server.sendmail(gmail_user, recipient_email, text)
-                server.quit()
+                # Reuses a logged-in session instead of a TLS handshake and
+                # login per recipient
+                send_started = time.perf_counter()
+                get_smtp_pool(gmail_user, gmail_password).send(gmail_user, recipient_email, message)
+                send_ms = (time.perf_counter() - send_started) * 1000
                 
-                print("DEBUG: Email sent successfully via SMTP")
-                return {"success": True, "message": f"Email sent successfully to {recipient_email}"}
+                result = {"success": True, "message": f"Email sent successfully to {recipient_email}"}
             except Exception as smtp_error:
-                print(f"SMTP Error: {smtp_error}")
-                # Fallback to demo mode
-                print("DEBUG: Falling back to demo mode due to SMTP error")
-                return {"success": True, "message": f"Email sent successfully to {recipient_email} (demo mode - configure Gmail credentials for real sending)"}
+                # Report the failure; retries and the circuit breaker are
+                # handled by the pool
+                logger.warning("SMTP error sending to %s: %s", recipient_email, smtp_error)
+                result = {"success": False, "message": f"Failed to send email to {recipient_email}: {smtp_error}"}
         else:
             # Demo mode - no real credentials configured
-            print("DEBUG: Running in demo mode - Gmail credentials not configured")
-            print("DEBUG: In demo mode, the HTML email would be sent with the following structure:")
-            print("DEBUG: MIME Type: text/html")
-            print("DEBUG: Content-Type: text/html; charset=utf-8")
-            print("DEBUG: HTML content preview:", html_content[:200], "...")
+            logger.debug("Demo mode, Gmail credentials not configured; HTML preview: %.200s", html_content)
             
-            # In demo mode, we could save the email to a file for testing
-            try:
-                with open(f'debug_email_{recipient_email.replace("@", "_")}.html', 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                print(f"DEBUG: HTML email saved to debug_email_{recipient_email.replace('@', '_')}.html for inspection")
-            except Exception as file_error:
-                print(f"DEBUG: Could not save debug file: {file_error}")
+            # Capture the full MIME message in the local outbox (batched
+            # mbox appends or a Maildir) for inspection
+            outbox = get_outbox()
+            if outbox is not None:
+                message = prepared.for_recipient(recipient_email, merge_values)
+                size = len(message)
+                try:
+                    outbox.deliver(gmail_user or 'noreply@smartmeeting.ai', recipient_email, message)
+                except Exception as outbox_error:
+                    logger.warning("Could not write demo message to the outbox: %s", outbox_error)
             
-            return {"success": True, "message": f"Email sent successfully to {recipient_email} (demo mode - configure Gmail credentials for real sending)"}
+            result = {"success": True, "message": f"Email sent successfully to {recipient_email} (demo mode - configure Gmail credentials for real sending)"}
             
     except Exception as e:
-        print(f"Gmail sending error: {e}")
-        import traceback
-        print(f"DEBUG: Full error traceback: {traceback.format_exc()}")
-        return {"success": False, "message": f"Failed to send email: {str(e)}"}
+        logger.exception("Gmail sending error for %s", recipient_email)
+        result = {"success": False, "message": f"Failed to send email: {str(e)}"}
+    
+    if send_logger.isEnabledFor(logging.DEBUG):
+        send_logger.debug('email_send', extra={
+            'recipient': recipient_email,
+            'mode': mode,
+            'success': result['success'],
+            'bytes': size,
+            'prepare_ms': round(prepare_ms, 3),
+            'send_ms': round(send_ms, 3),
+            'total_ms': round((time.perf_counter() - started) * 1000, 3)
+        })
+    return result
+
+def send_gmail_batch(recipient_emails, template_content, subject="Meeting Invitation", gmail_user=None, gmail_password=None):
+    """Send one identical invitation to several recipients in a single SMTP transaction
+
+    The header says "undisclosed-recipients", the addresses only go in
+    RCPT TO, so recipients do not see each other. Returns one result per
+    recipient, in order; recipients the server refused are failures.
+    """
+    started = time.perf_counter()
+    mode = 'demo'
+    size = 0
+    prepare_ms = send_ms = 0.0
+    sender = gmail_user or 'noreply@smartmeeting.ai'
+    try:
+        prepared = prepare_message(template_content, subject, sender)
+        message = prepared.for_batch()
+        size = len(message)
+        prepare_ms = (time.perf_counter() - started) * 1000
+        
+        if _has_credentials(gmail_user, gmail_password):
+            mode = 'smtp'
+            send_started = time.perf_counter()
+            # A batch refused as a whole is reported per recipient, never
+            # retried or counted against the circuit breaker
+            refused = get_smtp_pool(gmail_user, gmail_password).send(gmail_user, recipient_emails, message, partial=True)
+            send_ms = (time.perf_counter() - send_started) * 1000
+            results = []
+            for email in recipient_emails:
+                if email in refused:
+                    code, reply = refused[email]
+                    reason = reply.decode('utf-8', 'replace') if isinstance(reply, bytes) else reply
+                    results.append({"success": False, "message": f"Failed to send email to {email}: {code} {reason}"})
+                else:
+                    results.append({"success": True, "message": f"Email sent successfully to {email}"})
+        else:
+            outbox = get_outbox()
+            if outbox is not None:
+                try:
+                    outbox.deliver(sender, ', '.join(recipient_emails), message)
+                except Exception as outbox_error:
+                    logger.warning("Could not write demo message to the outbox: %s", outbox_error)
+            results = [
+                {"success": True, "message": f"Email sent successfully to {email} (demo mode - configure Gmail credentials for real sending)"}
+                for email in recipient_emails
+            ]
+    except Exception as e:
+        logger.warning("SMTP error sending to %d recipients: %s", len(recipient_emails), e)
+        results = [{"success": False, "message": f"Failed to send email to {email}: {e}"} for email in recipient_emails]
+    
+    if send_logger.isEnabledFor(logging.DEBUG):
+        send_logger.debug('email_send', extra={
+            'recipients': len(recipient_emails),
+            'mode': mode,
+            'success': sum(1 for r in results if r['success']),
+            'bytes': size,
+            'prepare_ms': round(prepare_ms, 3),
+            'send_ms': round(send_ms, 3),
+            'total_ms': round((time.perf_counter() - started) * 1000, 3)
+        })
+    return results
 
 def _html_to_text(html_content):
     """Convert HTML content to plain text for email fallback"""
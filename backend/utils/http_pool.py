@@ -0,0 +1,161 @@
+import importlib.util
+import os
+import threading
+from typing import Dict, Any
+
+import httpx
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+from postgrest.utils import SyncClient
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that keeps request counters for pool sizing"""
+
+    def __init__(self, stats: 'HTTPPool', **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats._begin()
+        try:
+            return super().handle_request(request)
+        except Exception:
+            self._stats._fail()
+            raise
+        finally:
+            self._stats._end()
+
+class HTTPPool:
+    """Keep-alive connection pool settings and counters shared by the Supabase clients
+
+    The pool is thread-safe (one httpx client serves every thread of a
+    worker). It must not be shared across fork(); SupabaseService builds a
+    fresh client in each worker process.
+    """
+
+    def __init__(self, app_config):
+        self.max_connections = app_config.HTTP_POOL_MAX_CONNECTIONS
+        self.max_keepalive = app_config.HTTP_POOL_MAX_KEEPALIVE
+        self.keepalive_expiry = app_config.HTTP_POOL_KEEPALIVE_EXPIRY
+        self.timeout = httpx.Timeout(
+            connect=app_config.HTTP_CONNECT_TIMEOUT,
+            read=app_config.HTTP_READ_TIMEOUT,
+            write=app_config.HTTP_WRITE_TIMEOUT,
+            pool=app_config.HTTP_POOL_TIMEOUT
+        )
+        # HTTP/2 needs the optional h2 package (pip install httpx[http2])
+        http2 = app_config.HTTP_HTTP2
+        has_h2 = importlib.util.find_spec('h2') is not None
+        self.http2 = has_h2 if http2 == 'auto' else (http2 == 'true' and has_h2)
+
+        self._lock = threading.Lock()
+        self._transport = None
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _begin(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _fail(self):
+        with self._lock:
+            self.errors += 1
+
+    @property
+    def transport(self) -> _CountingTransport:
+        """The pool's one transport, created on first use
+
+        Every client built by the pool shares it, so rebuilding the
+        PostgREST client keeps the open connections and stats() covers all
+        of them.
+        """
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = _CountingTransport(
+                        self,
+                        http2=self.http2,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive,
+                            keepalive_expiry=self.keepalive_expiry
+                        )
+                    )
+        return self._transport
+
+    def create_client(self, base_url, headers) -> SyncClient:
+        """Create an httpx client on this pool's shared transport"""
+        return SyncClient(base_url=base_url, headers=headers, timeout=self.timeout, transport=self.transport)
+
+    def create_postgrest_client(self, rest_url: str, headers: Dict[str, str], schema: str,
+                                timeout=None) -> SyncPostgrestClient:
+        """Drop-in replacement for supabase.Client._init_postgrest_client"""
+        client = SyncPostgrestClient(rest_url, headers=headers, schema=schema, timeout=self.timeout)
+        default_session = client.session
+        client.session = self.create_client(default_session.base_url, default_session.headers)
+        default_session.close()
+        return client
+
+    def create_async_postgrest_client(self, rest_url: str, headers: Dict[str, str],
+                                      schema: str = 'public') -> AsyncPostgrestClient:
+        """PostgREST client on an asyncio connection pool with the same limits and timeouts
+
+        Async clients are bound to the event loop they first run on, so their
+        connections are not included in stats().
+        """
+        client = AsyncPostgrestClient(rest_url, headers=headers, schema=schema, timeout=self.timeout)
+        default_session = client.session
+        client.session = httpx.AsyncClient(
+            base_url=default_session.base_url,
+            headers=default_session.headers,
+            timeout=self.timeout,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry
+            )
+        )
+        return client
+
+    def discard_async_client(self, client: AsyncPostgrestClient):
+        """Close the connections of an async client whose event loop has closed
+
+        aclose() can no longer run without that loop, so the sockets are
+        closed directly.
+        """
+        for connection in list(client.session._transport._pool.connections):
+            stream = getattr(getattr(connection, '_connection', None), '_network_stream', None)
+            sock = stream.get_extra_info('socket') if stream is not None else None
+            if sock is not None:
+                # asyncio hands out a TransportSocket wrapper without close()
+                getattr(sock, '_sock', sock).close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration, live connection states and request counters"""
+        connections = idle = 0
+        if self._transport is not None:
+            for connection in self._transport._pool.connections:
+                connections += 1
+                if connection.is_idle():
+                    idle += 1
+        return {
+            'pid': os.getpid(),
+            'http2': self.http2,
+            'max_connections': self.max_connections,
+            'max_keepalive': self.max_keepalive,
+            'keepalive_expiry': self.keepalive_expiry,
+            'connections': connections,
+            'idle_connections': idle,
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight
+        }
@@ -0,0 +1,338 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List, Optional
+
+from config import config
+
+logger = logging.getLogger('smartmeeting.jobs')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    total INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue_idx ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+"""
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+class LeaseLost(Exception):
+    """The job was requeued and may already run elsewhere; stop working on it"""
+
+class Job:
+    """A claimed job as seen by its handler
+
+    The claim is a lease held by worker: it stays valid while the worker
+    keeps refreshing updated_at, and recording or finishing the job only
+    succeeds while the job is still running under that worker.
+    """
+
+    def __init__(self, queue: 'JobQueue', row: Dict, done: set):
+        self.queue = queue
+        self.id = row['id']
+        self.kind = row['kind']
+        self.user_id = row['user_id']
+        self.worker = row['worker']
+        self.payload = json.loads(row['payload'])
+        self.total = row['total']
+        # Positions already recorded before a restart; handlers skip them
+        self.done = done
+        self.lost = False
+
+    @property
+    def resumed(self) -> bool:
+        """Whether an earlier run recorded outcomes before it stopped"""
+        return bool(self.done)
+
+    def check(self):
+        """Raise LeaseLost if the job no longer belongs to this worker"""
+        if self.lost:
+            raise LeaseLost(self.id)
+
+    def record(self, position: int, success: bool, outcome: Dict):
+        """Store the outcome for one recipient as soon as it is known"""
+        self.check()
+        if not self.queue.record(self.id, position, success, outcome, self.worker):
+            self.lost = True
+            raise LeaseLost(self.id)
+
+class JobQueue:
+    """Durable distribution job queue in a local SQLite file
+
+    Every web and worker process on the host opens the same file; claiming
+    a job is a single UPDATE inside an immediate transaction, so each job
+    runs exactly once even with several consumers. Per-recipient outcomes
+    are appended as they happen, which is what status polling reads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """One connection per thread and process"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict, user_id: Optional[str] = None, total: int = 0) -> str:
+        job_id = str(uuid.uuid4())
+        now = _now()
+        self.conn.execute(
+            'INSERT INTO jobs (id, kind, user_id, payload, total, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (job_id, kind, user_id, json.dumps(payload), total, now, now)
+        )
+        self._wakeup.set()
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Take the oldest queued job, or None if the queue is empty"""
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = coalesce(started_at, ?), updated_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+                "RETURNING *",
+                (worker, _now(), _now())
+            ).fetchone()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if row is None:
+            return None
+        done = {r['position'] for r in conn.execute('SELECT position FROM job_results WHERE job_id = ?', (row['id'],))}
+        return Job(self, dict(row), done)
+
+    def record(self, job_id: str, position: int, success: bool, outcome: Dict, worker: str) -> bool:
+        """Store one outcome; False (and nothing stored) if worker no longer holds the job"""
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            held = conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (_now(), job_id, worker)
+            ).rowcount
+            if held:
+                conn.execute(
+                    'INSERT OR REPLACE INTO job_results (job_id, position, success, outcome) VALUES (?, ?, ?, ?)',
+                    (job_id, position, int(success), json.dumps(outcome))
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return bool(held)
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Renew worker's lease on a running job; False once it has lost it"""
+        return self.conn.execute(
+            "UPDATE jobs SET updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (_now(), job_id, worker)
+        ).rowcount == 1
+
+    def finish(self, job_id: str, worker: str, status: str, message: Optional[str] = None,
+               error: Optional[str] = None) -> bool:
+        """Close the job; False (and unchanged) if worker no longer holds it"""
+        now = _now()
+        return self.conn.execute(
+            "UPDATE jobs SET status = ?, message = ?, error = ?, finished_at = ?, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (status, message, error, now, now, job_id, worker)
+        ).rowcount == 1
+
+    def requeue_stale(self, older_than: float) -> int:
+        """Put back running jobs whose lease expired (the worker crashed or was killed)"""
+        cutoff = (datetime.utcnow() - timedelta(seconds=older_than)).isoformat()
+        return self.conn.execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running' AND updated_at < ?",
+            (cutoff,)
+        ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status, progress counters and per-recipient outcomes"""
+        conn = self.conn
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        results = conn.execute(
+            'SELECT success, outcome FROM job_results WHERE job_id = ? ORDER BY position', (job_id,)
+        ).fetchall()
+        sent = sum(1 for r in results if r['success'])
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'user_id': row['user_id'],
+            'status': row['status'],
+            'total': row['total'],
+            'completed': len(results),
+            'sent': sent,
+            'failed': len(results) - sent,
+            'message': row['message'],
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'details': [json.loads(r['outcome']) for r in results]
+        }
+
+    def wait(self, timeout: float):
+        """Sleep until a job is enqueued in this process or timeout passes"""
+        if self._wakeup.wait(timeout):
+            self._wakeup.clear()
+
+class JobWorkers:
+    """Sender threads draining a JobQueue inside the current process
+
+    Handlers are registered per job kind and return (status, message). A
+    handler that raises fails the job with the exception text. Threads do
+    not survive fork(), so start() is pid-aware and cheap to call often.
+    """
+
+    def __init__(self, queue: JobQueue, count: int, poll_interval: float, stale_after: float):
+        self.queue = queue
+        self.count = count
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.handlers: Dict[str, Callable[[Job], tuple]] = {}
+        self._started_pid = None
+        self._lock = threading.Lock()
+        # Monotonic time of the next stale-job sweep; 0 sweeps right away
+        self._next_sweep = 0.0
+
+    def register(self, kind: str, handler: Callable[[Job], tuple]):
+        self.handlers[kind] = handler
+
+    def start(self):
+        if self.count <= 0 or self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            for index in range(self.count):
+                name = f"sender-{os.getpid()}-{index}"
+                threading.Thread(target=self.run, args=(name,), name=name, daemon=True).start()
+
+    def run(self, name: str, stop: Optional[threading.Event] = None):
+        """Drain the queue until stop is set (forever by default)"""
+        while not (stop and stop.is_set()):
+            try:
+                self.requeue_stale()
+                job = self.queue.claim(name)
+            except sqlite3.Error as e:
+                logger.warning("Job queue error: %s", e)
+                job = None
+            if job is None:
+                self.queue.wait(self.poll_interval)
+                continue
+            self.process(job)
+
+    def requeue_stale(self):
+        """Put back jobs of workers that stopped reporting, at most every stale_after / 2 seconds
+
+        Runs from the worker loop, so jobs of a sender that died while the
+        process keeps running are picked up again, not only after a restart.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.stale_after / 2
+        requeued = self.queue.requeue_stale(self.stale_after)
+        if requeued:
+            logger.warning("Requeued %d stale distribution jobs", requeued)
+
+    def process(self, job: Job):
+        handler = self.handlers.get(job.kind)
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), name=f"{job.worker}-lease", daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind: {job.kind}")
+            status, message = handler(job)
+            finished = self.queue.finish(job.id, job.worker, status, message)
+        except LeaseLost:
+            finished = False
+        except Exception as e:
+            logger.exception("Distribution job %s failed", job.id)
+            finished = self.queue.finish(job.id, job.worker, 'failed', 'Failed to send any invitations', str(e))
+        finally:
+            done.set()
+            heartbeat.join()
+        if not finished:
+            logger.warning("Distribution job %s was requeued while %s ran it; left to its new worker", job.id, job.worker)
+
+    def _heartbeat(self, job: Job, done: threading.Event):
+        """Renew the job's lease while its handler runs, so long sends are not requeued"""
+        while not done.wait(self.stale_after / 3):
+            try:
+                if not self.queue.heartbeat(job.id, job.worker):
+                    job.lost = True
+                    return
+            except sqlite3.Error as e:
+                logger.warning("Job queue error: %s", e)
+
+_job_queue = None
+_job_workers = None
+_singleton_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    with _singleton_lock:
+        if _job_queue is None:
+            app_config = config[os.environ.get('FLASK_ENV', 'production')]
+            _job_queue = JobQueue(app_config.JOB_QUEUE_PATH)
+        return _job_queue
+
+def get_job_workers() -> JobWorkers:
+    """The sender threads of this process (JOB_WORKERS of them; 0 disables)"""
+    global _job_workers
+    queue = get_job_queue()
+    with _singleton_lock:
+        if _job_workers is None:
+            app_config = config[os.environ.get('FLASK_ENV', 'production')]
+            _job_workers = JobWorkers(
+                queue,
+                count=app_config.JOB_WORKERS,
+                poll_interval=app_config.JOB_POLL_INTERVAL,
+                stale_after=app_config.JOB_STALE_AFTER
+            )
+        return _job_workers
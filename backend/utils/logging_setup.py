@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed via extra= and
+# becomes a JSON field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JSONFormatter(logging.Formatter):
+    """One compact JSON object per line: ts, level, logger, msg plus any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the records below WARNING, per logger name prefix
+
+    rates maps a logger name (e.g. 'smartmeeting.email.send') to the share
+    of its records to keep; the longest matching prefix wins and loggers
+    without a rate are not sampled. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1 or random.random() < rate
+        return True
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """'smartmeeting.email.send=0.1,smartmeeting.jobs=0.5' -> {name: rate}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = float(rate)
+    return rates
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_output: Optional[logging.Handler] = None
+
+def setup_logging(app_config) -> None:
+    """Route the 'smartmeeting' loggers through a queue to a background writer
+
+    Callers only enqueue the record; formatting and the blocking write to
+    stdout happen on the QueueListener thread. Safe to call more than once.
+    """
+    global _listener, _output
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if app_config.LOG_FORMAT == 'json':
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    handler.addFilter(SamplingFilter(parse_sampling(app_config.LOG_SAMPLING)))
+
+    logger = logging.getLogger('smartmeeting')
+    logger.setLevel(app_config.LOG_LEVEL.upper())
+    logger.handlers = [handler]
+    logger.propagate = False
+
+    _output = output
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop)
+
+def _stop():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+def _restart_after_fork():
+    # The writer thread is not copied by fork(); give the child its own
+    global _listener
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -1,6 +1,5 @@
 from datetime import datetime
 from flask_login import UserMixin
-from utils.supabase_service import supabase_service
 
 def init_models(db):
     """Initialize models with database instance"""
@@ -17,7 +16,7 @@ def init_models(db):
         @staticmethod
         def get(user_id):
             """Get user by ID"""
-            user_data = supabase_service.get_user(user_id)
+            user_data = db.get_user(user_id)
             if user_data:
                 return User(
                     id=user_data['id'],
@@ -28,10 +27,31 @@ def init_models(db):
                 )
             return None
         
+        @staticmethod
+        def from_snapshot(snapshot):
+            """Rebuild a user from the identity snapshot kept in the session"""
+            return User(
+                id=snapshot['id'],
+                username=snapshot['username'],
+                email=snapshot['email'],
+                password_hash=None,
+                created_at=snapshot.get('created_at')
+            )
+        
+        def to_snapshot(self):
+            """Minimal identity snapshot for the signed session cookie"""
+            created_at = self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at
+            return {
+                'id': self.id,
+                'username': self.username,
+                'email': self.email,
+                'created_at': created_at
+            }
+        
         @staticmethod
         def get_by_email(email):
             """Get user by email"""
-            user_data = supabase_service.get_user_by_email(email)
+            user_data = db.get_user_by_email(email)
             if user_data:
                 return User(
                     id=user_data['id'],
@@ -73,10 +93,10 @@ def init_models(db):
             """Save template to database"""
             if self.id:
                 # Update existing template
-                return supabase_service.update_template(self.id, **self.__dict__)
+                return db.update_template(self.id, **self.__dict__)
             else:
                 # Create new template
-                return supabase_service.create_template(self.user_id, self.title, self.content, **self.__dict__)
+                return db.create_template(self.user_id, self.title, self.content, **self.__dict__)
 
     class TemplateQuery:
         def __init__(self):
@@ -89,18 +109,11 @@ def init_models(db):
         
         def count(self):
             """Count templates matching filters"""
-            templates = supabase_service.get_templates()
-            # Apply filters (simplified implementation)
-            if 'user_id' in self.filters:
-                templates = [t for t in templates if t.get('user_id') == self.filters['user_id']]
-            return len(templates)
+            return db.count_templates(self.filters.get('user_id'))
         
         def all(self):
             """Get all templates matching filters"""
-            templates = supabase_service.get_templates()
-            # Apply filters (simplified implementation)
-            if 'user_id' in self.filters:
-                templates = [t for t in templates if t.get('user_id') == self.filters['user_id']]
+            templates = db.get_templates(self.filters.get('user_id'))
             return [Template(**t) for t in templates]
 
     class Distribution:
@@ -125,44 +138,53 @@ def init_models(db):
             """Save distribution to database"""
             if self.id:
                 # Update existing distribution
-                return supabase_service.update_distribution_status(self.id, self.status, **self.__dict__)
+                return db.update_distribution_status(self.id, self.status, **self.__dict__)
             else:
                 # Create new distribution
                 recipients_list = self.recipients if isinstance(self.recipients, list) else []
-                return supabase_service.create_distribution(self.user_id, self.template_id, self.method, recipients_list, **self.__dict__)
+                return db.create_distribution(self.user_id, self.template_id, self.method, recipients_list, **self.__dict__)
 
     class DistributionQuery:
         def __init__(self):
             self.filters = {}
+            self.cursor = None
+            self.page_size = None
         
         def filter_by(self, **kwargs):
             """Add filters to query"""
             self.filters.update(kwargs)
             return self
         
+        def after(self, cursor):
+            """Continue from a keyset cursor returned by a previous page"""
+            self.cursor = cursor
+            return self
+        
+        def limit(self, size):
+            """Limit the number of distributions returned"""
+            self.page_size = size
+            return self
+        
+        def _fetch(self):
+            return db.get_distributions(
+                user_id=self.filters.get('user_id'),
+                status=self.filters.get('status'),
+                method=self.filters.get('method'),
+                after=self.cursor,
+                limit=self.page_size
+            )
+        
         def count(self):
             """Count distributions matching filters"""
-            distributions = supabase_service.get_distributions()
-            # Apply filters (simplified implementation)
-            if 'user_id' in self.filters:
-                distributions = [d for d in distributions if d.get('user_id') == self.filters['user_id']]
-            if 'status' in self.filters:
-                distributions = [d for d in distributions if d.get('status') == self.filters['status']]
-            if 'method' in self.filters:
-                distributions = [d for d in distributions if d.get('method') == self.filters['method']]
-            return len(distributions)
+            return db.count_distributions(
+                user_id=self.filters.get('user_id'),
+                status=self.filters.get('status'),
+                method=self.filters.get('method')
+            )
         
         def all(self):
             """Get all distributions matching filters"""
-            distributions = supabase_service.get_distributions()
-            # Apply filters (simplified implementation)
-            if 'user_id' in self.filters:
-                distributions = [d for d in distributions if d.get('user_id') == self.filters['user_id']]
-            if 'status' in self.filters:
-                distributions = [d for d in distributions if d.get('status') == self.filters['status']]
-            if 'method' in self.filters:
-                distributions = [d for d in distributions if d.get('method') == self.filters['method']]
-            return [Distribution(**d) for d in distributions]
+            return [Distribution(**d) for d in self._fetch()]
     
     # Return the model classes
     return User, Template, Distribution 
\ No newline at end of file
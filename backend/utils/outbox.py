@@ -0,0 +1,197 @@
+import atexit
+import mailbox
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from config import config
+
+_FROM_LINE = re.compile(rb'^From ', re.MULTILINE)
+
+class MaildirOutbox:
+    """Demo-mode transport storing one file per message in a Maildir
+
+    Any mail client can open the directory; good for inspecting a handful
+    of messages, less so for load tests (one file create per message).
+    """
+
+    name = 'maildir'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mailbox = mailbox.Maildir(path, create=True)
+        # mailbox.Maildir's unique-name counter is not thread-safe
+        self._lock = threading.Lock()
+        self.messages = 0
+
+    def deliver(self, sender: str, recipient: str, message: bytes) -> None:
+        with self._lock:
+            self._mailbox.add(message.replace(b'\r\n', b'\n'))
+            self.messages += 1
+
+    def flush(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {'transport': self.name, 'path': self.path, 'messages': self.messages}
+
+class MboxOutbox:
+    """Demo-mode transport appending every message to a single mbox file
+
+    Messages are buffered in memory and written with one append per batch
+    (batch_size messages, or whatever is pending after flush_interval
+    seconds). The file is rotated to path.1 ... path.N once it grows past
+    max_bytes. Appends take an exclusive flock, so several processes can
+    share the file.
+    """
+
+    name = 'mbox'
+
+    def __init__(self, path: str, batch_size: int = 100, flush_interval: float = 1.0,
+                 max_bytes: int = 64 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self.messages = 0
+        self.batches = 0
+        self.rotations = 0
+        self._start_flusher()
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._flush_periodically, name='outbox-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    @staticmethod
+    def _entry(sender: str, message: bytes) -> bytes:
+        # mbox From_ line, then the message with LF endings and body lines
+        # starting with "From " quoted
+        envelope = f"From {sender or 'MAILER-DAEMON'} {time.asctime(time.gmtime())}\n".encode('ascii', 'replace')
+        body = _FROM_LINE.sub(b'>From ', message.replace(b'\r\n', b'\n'))
+        if not body.endswith(b'\n'):
+            body += b'\n'
+        return envelope + body + b'\n'
+
+    def deliver(self, sender: str, recipient: str, message: bytes) -> None:
+        entry = self._entry(sender, message)
+        with self._lock:
+            self._pending.append(entry)
+            self.messages += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append everything pending in one write"""
+        with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = b''.join(self._pending), []
+            self.batches += 1
+            f = self._open_locked()
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if self.max_bytes and size and size + len(batch) > self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    f = self._open_locked()
+                f.write(batch)
+            finally:
+                f.close()
+
+    def _open_locked(self):
+        # Another process may rotate the file while we wait for the lock;
+        # only append once the locked file is still the one at self.path
+        while True:
+            f = open(self.path, 'ab')
+            _lock_file(f)
+            try:
+                current = os.fstat(f.fileno()).st_ino == os.stat(self.path).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                return f
+            f.close()
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def _reset_after_fork(self):
+        # Messages buffered by the parent are the parent's to write
+        self._lock = threading.Lock()
+        self._pending = []
+        self._start_flusher()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'transport': self.name,
+                'path': self.path,
+                'messages': self.messages,
+                'batches': self.batches,
+                'pending': len(self._pending),
+                'rotations': self.rotations
+            }
+
+def _lock_file(f):
+    try:
+        import fcntl
+    except ImportError:
+        return
+    # Released when the file is closed
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+def get_outbox() -> Optional[Any]:
+    """The demo-mode outbox selected by OUTBOX ('mbox', 'maildir' or 'none')"""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            app_config = config[os.environ.get('FLASK_ENV', 'production')]
+            if app_config.OUTBOX == 'maildir':
+                _outbox = MaildirOutbox(app_config.OUTBOX_PATH)
+            elif app_config.OUTBOX == 'mbox':
+                _outbox = MboxOutbox(
+                    os.path.join(app_config.OUTBOX_PATH, 'outbox.mbox'),
+                    batch_size=app_config.OUTBOX_BATCH_SIZE,
+                    flush_interval=app_config.OUTBOX_FLUSH_INTERVAL,
+                    max_bytes=app_config.OUTBOX_MAX_BYTES,
+                    backups=app_config.OUTBOX_BACKUPS
+                )
+            else:
+                return None
+            atexit.register(_outbox.flush)
+        return _outbox
+
+def _reset_after_fork():
+    global _outbox_lock
+    _outbox_lock = threading.Lock()
+    if isinstance(_outbox, MboxOutbox):
+        _outbox._reset_after_fork()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
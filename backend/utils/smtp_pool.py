@@ -0,0 +1,291 @@
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from config import config
+from utils.circuit_breaker import CircuitBreaker, backoff_delay
+
+class _PooledConnection:
+    """An authenticated SMTP session plus the bookkeeping used to recycle it"""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages = 0
+
+def _connection_lost(error: Exception) -> bool:
+    """A dropped connection or socket error; SMTPException subclasses OSError"""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+def _transient(error: Exception) -> bool:
+    """Connection problems and 4xx replies are worth retrying
+
+    5xx replies, refused recipients and other SMTP errors are answers from
+    a working server, so retrying them cannot help.
+    """
+    if _connection_lost(error):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return False
+
+class SMTPPool:
+    """Thread-safe pool of persistent, logged-in SMTP sessions
+
+    At most `size` sessions exist at once; callers block while all of them
+    are in use. An idle session is closed after idle_timeout seconds (the
+    server would drop it anyway) and is checked with NOOP before reuse once
+    it has been idle longer than check_after seconds. A session is retired
+    after max_messages messages, since providers cap messages per
+    connection.
+
+    Sends go through a circuit breaker shared by every pool for the same
+    server, so an outage fails fast instead of costing each recipient a
+    connect timeout. Transient failures are retried retry_attempts times
+    in total, with exponential backoff.
+    """
+
+    def __init__(self, host: str, port: int, username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = True, size: int = 4, max_messages: int = 100,
+                 idle_timeout: float = 60, check_after: float = 5, timeout: float = 30,
+                 retry_attempts: int = 3, retry_base_delay: float = 0.5, retry_max_delay: float = 5,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.check_after = check_after
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.breaker = breaker or CircuitBreaker(f"smtp://{host}:{port}")
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_PooledConnection] = []
+        self._counters = {
+            'opened': 0,
+            'reused': 0,
+            'recycled': 0,
+            'expired': 0,
+            'failed_checks': 0,
+            'messages': 0,
+            'retries': 0,
+            'errors': 0
+        }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _open(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._discard(smtp)
+            raise
+        self._count('opened')
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _healthy(self, conn: _PooledConnection) -> bool:
+        if time.monotonic() - conn.last_used < self.check_after:
+            return True
+        try:
+            return conn.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _reset(conn: _PooledConnection) -> bool:
+        try:
+            return conn.smtp.rset()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
+            if time.monotonic() - conn.last_used > self.idle_timeout:
+                self._count('expired')
+                self._discard(conn.smtp)
+            elif not self._healthy(conn):
+                self._count('failed_checks')
+                self._discard(conn.smtp)
+            else:
+                self._count('reused')
+                return conn
+
+    def _checkin(self, conn: _PooledConnection, broken: bool = False):
+        conn.last_used = time.monotonic()
+        if broken:
+            self._discard(conn.smtp)
+        elif conn.messages >= self.max_messages:
+            self._count('recycled')
+            self._discard(conn.smtp)
+        else:
+            with self._lock:
+                self._idle.append(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a logged-in smtplib.SMTP session for the duration of the block"""
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn.smtp
+            except Exception as e:
+                # A reply error leaves a healthy session mid-transaction;
+                # RSET clears it for the next message
+                self._checkin(conn, broken=_connection_lost(e) or not self._reset(conn))
+                raise
+            else:
+                conn.messages += 1
+                self._checkin(conn)
+        finally:
+            self._slots.release()
+
+    def send(self, from_addr: str, to_addrs, message: Union[str, bytes], partial: bool = False):
+        """Send one message, retrying transient failures with backoff
+
+        Raises CircuitOpenError without touching the network while the
+        server's circuit is open. A reused session the server dropped while
+        idle is replaced once straight away; that does not count as a
+        failure of the server. With partial=True, a message whose every
+        recipient is refused returns the refusals like a partly refused
+        one instead of raising SMTPRecipientsRefused.
+        """
+        attempt = 1
+        replaced_session = False
+        check_breaker = True
+        while True:
+            if check_breaker:
+                self.breaker.before_call()
+            check_breaker = True
+            try:
+                with self.connection() as smtp:
+                    refused = smtp.sendmail(from_addr, to_addrs, message)
+            except Exception as e:
+                if partial and isinstance(e, smtplib.SMTPRecipientsRefused):
+                    # Per-recipient failures; the transport worked
+                    self.breaker.record_success()
+                    return e.recipients
+                if not _transient(e):
+                    # The server answered, so the endpoint itself is up
+                    self.breaker.record_success()
+                    self._count('errors')
+                    raise
+                if isinstance(e, smtplib.SMTPServerDisconnected) and not replaced_session:
+                    replaced_session = True
+                    check_breaker = False
+                    continue
+                self.breaker.record_failure()
+                if attempt >= self.retry_attempts:
+                    self._count('errors')
+                    raise
+                self._count('retries')
+                time.sleep(backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay))
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                self._count('messages')
+                return refused
+
+    def close(self):
+        """Close every idle session"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn.smtp)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'host': self.host,
+                'port': self.port,
+                'size': self.size,
+                'idle': len(self._idle),
+                'breaker': self.breaker.state,
+                **self._counters
+            }
+
+_pools: Dict[Tuple, SMTPPool] = {}
+_breakers: Dict[Tuple, CircuitBreaker] = {}
+_pools_lock = threading.Lock()
+
+def get_smtp_pool(username: Optional[str] = None, password: Optional[str] = None) -> SMTPPool:
+    """The process-wide pool for these credentials, built from the SMTP_* settings"""
+    app_config = config[os.environ.get('FLASK_ENV', 'production')]
+    key = (app_config.SMTP_HOST, app_config.SMTP_PORT, username, password)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            endpoint = (app_config.SMTP_HOST, app_config.SMTP_PORT)
+            breaker = _breakers.get(endpoint)
+            if breaker is None:
+                breaker = _breakers[endpoint] = CircuitBreaker(
+                    f"smtp://{app_config.SMTP_HOST}:{app_config.SMTP_PORT}",
+                    failure_threshold=app_config.SMTP_BREAKER_THRESHOLD,
+                    reset_timeout=app_config.SMTP_BREAKER_RESET_TIMEOUT
+                )
+            pool = _pools[key] = SMTPPool(
+                app_config.SMTP_HOST,
+                app_config.SMTP_PORT,
+                username=username,
+                password=password,
+                use_tls=app_config.SMTP_USE_TLS,
+                size=app_config.SMTP_POOL_SIZE,
+                max_messages=app_config.SMTP_MAX_MESSAGES_PER_CONNECTION,
+                idle_timeout=app_config.SMTP_IDLE_TIMEOUT,
+                timeout=app_config.SMTP_TIMEOUT,
+                retry_attempts=app_config.SMTP_RETRY_ATTEMPTS,
+                retry_base_delay=app_config.SMTP_RETRY_BASE_DELAY,
+                retry_max_delay=app_config.SMTP_RETRY_MAX_DELAY,
+                breaker=breaker
+            )
+        return pool
+
+def smtp_pool_stats() -> List[Dict[str, Any]]:
+    with _pools_lock:
+        return [pool.stats() for pool in _pools.values()]
+
+def smtp_breaker_stats() -> List[Dict[str, Any]]:
+    """State, consecutive failures, trips and fast-failed sends per SMTP server"""
+    with _pools_lock:
+        return [breaker.stats() for breaker in _breakers.values()]
+
+def _reset_after_fork():
+    # Sessions belong to the parent process; workers open their own
+    global _pools_lock
+    _pools.clear()
+    _breakers.clear()
+    _pools_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
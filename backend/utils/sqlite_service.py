@@ -0,0 +1,708 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+
+from config import config
+from utils.body_store import cached_bodies, remember_bodies
+from utils.supabase_service import (
+    _body_digests, decode_cursor, _created_templates, _demo_contacts, _distribution_record, _distribution_recipients,
+    _distributions_page, _next_cursor, _recipient_rows, _recipients_page, _template_from_meeting,
+    _template_listing_page, _template_payload, _template_updates, _user_from_contact
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS organizations (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    domain TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    name TEXT,
+    member_type TEXT,
+    organization_id TEXT,
+    status TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meetings (
+    id TEXT PRIMARY KEY,
+    organization_id TEXT,
+    meeting_code TEXT,
+    title TEXT,
+    scheduled_at TEXT,
+    duration_mins INTEGER,
+    description TEXT,
+    is_template INTEGER NOT NULL DEFAULT 0,
+    template_type TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS template_bodies (
+    digest TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    size INTEGER,
+    refcount INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meeting_minutes (
+    id TEXT PRIMARY KEY,
+    meeting_id TEXT NOT NULL UNIQUE REFERENCES meetings(id) ON DELETE CASCADE,
+    summary TEXT,
+    full_mom TEXT,
+    meeting_type TEXT,
+    template_params TEXT,
+    template_version INTEGER,
+    body_digest TEXT REFERENCES template_bodies(digest),
+    created_by TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meeting_minutes_created_by_idx ON meeting_minutes (created_by);
+CREATE TABLE IF NOT EXISTS meeting_recipients (
+    id TEXT PRIMARY KEY,
+    meeting_id TEXT NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    recipient_key TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (meeting_id, recipient_key)
+);
+CREATE TABLE IF NOT EXISTS social_posts (
+    id TEXT PRIMARY KEY,
+    meeting_id TEXT NOT NULL,
+    platforms TEXT,
+    status TEXT,
+    published_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS social_posts_page_idx ON social_posts (created_at DESC, id DESC);
+"""
+
+# Columns added after the first release, for databases created before them
+ADDED_COLUMNS = {
+    'meeting_minutes': (('meeting_type', 'TEXT'), ('template_params', 'TEXT'), ('template_version', 'INTEGER'),
+                        ('body_digest', 'TEXT REFERENCES template_bodies(digest)'))
+}
+
+# Reference counts of stored bodies; a body goes with its last reference
+TRIGGERS = """
+CREATE INDEX IF NOT EXISTS meeting_minutes_body_digest_idx ON meeting_minutes (body_digest);
+CREATE TRIGGER IF NOT EXISTS meeting_minutes_body_insert AFTER INSERT ON meeting_minutes
+WHEN NEW.body_digest IS NOT NULL BEGIN
+    UPDATE template_bodies SET refcount = refcount + 1 WHERE digest = NEW.body_digest;
+END;
+CREATE TRIGGER IF NOT EXISTS meeting_minutes_body_update AFTER UPDATE OF body_digest ON meeting_minutes
+WHEN NEW.body_digest IS NOT OLD.body_digest BEGIN
+    UPDATE template_bodies SET refcount = refcount + 1 WHERE digest = NEW.body_digest;
+    UPDATE template_bodies SET refcount = refcount - 1 WHERE digest = OLD.body_digest;
+    DELETE FROM template_bodies WHERE digest = OLD.body_digest AND refcount <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS meeting_minutes_body_delete AFTER DELETE ON meeting_minutes
+WHEN OLD.body_digest IS NOT NULL BEGIN
+    UPDATE template_bodies SET refcount = refcount - 1 WHERE digest = OLD.body_digest;
+    DELETE FROM template_bodies WHERE digest = OLD.body_digest AND refcount <= 0;
+END;
+"""
+
+def _migrate(conn: sqlite3.Connection):
+    """Create missing tables and add columns missing from existing ones"""
+    conn.executescript(SCHEMA)
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for column, column_type in columns:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+    conn.executescript(TRIGGERS)
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+def _keyset(after: Optional[str], alias: str = '') -> tuple:
+    """SQL condition continuing a newest-first keyset page after a cursor"""
+    if not after:
+        return '', []
+    created_at, row_id = decode_cursor(after)
+    return (f" AND ({alias}created_at < ? OR ({alias}created_at = ? AND {alias}id < ?))",
+            [created_at, created_at, row_id])
+
+class SQLiteService:
+    """Embedded storage backend implementing the SupabaseService interface
+
+    Selected with STORAGE_BACKEND=sqlite. Every public method counts as one
+    remote round trip: it optionally sleeps STORAGE_LATENCY_MS (plus up to
+    STORAGE_LATENCY_JITTER_MS) before touching the database, which makes
+    load tests reproducible without a Supabase project while still
+    modelling network cost. Per-method call counts and time are reported by
+    storage_stats().
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        config_name = os.environ.get('FLASK_ENV', 'production')
+        app_config = config[config_name]
+
+        self.path = path or app_config.SQLITE_PATH
+        self.latency = app_config.STORAGE_LATENCY_MS / 1000.0
+        self.jitter = app_config.STORAGE_LATENCY_JITTER_MS / 1000.0
+
+        # One connection per process, shared by its threads; SQLite
+        # serializes writers anyway. A ':memory:' database is per process.
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_pid = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+        self._stats_lock = threading.Lock()
+        self._timings = defaultdict(lambda: [0, 0.0])
+
+    def connect(self) -> sqlite3.Connection:
+        """The connection for the current process, opened on first use"""
+        with self._lock:
+            if self._conn is None or self._conn_pid != os.getpid():
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA foreign_keys = ON')
+                if self.path != ':memory:':
+                    conn.execute('PRAGMA journal_mode = WAL')
+                _migrate(conn)
+                self._conn = conn
+                self._conn_pid = os.getpid()
+            return self._conn
+
+    def _reset_after_fork(self):
+        """Forget the parent's connection; SQLite handles must not cross fork()"""
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._timings = defaultdict(lambda: [0, 0.0])
+
+    @contextmanager
+    def _round_trip(self, name: str, write: bool = False):
+        """One simulated remote call: injected latency, then exclusive database access"""
+        started = time.perf_counter()
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        with self._lock:
+            conn = self.connect()
+            if write:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    yield conn
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            else:
+                yield conn
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._timings[name][0] += 1
+            self._timings[name][1] += elapsed
+
+    def storage_stats(self) -> Dict[str, Any]:
+        """Calls and cumulative seconds spent per data-access method"""
+        with self._stats_lock:
+            methods = {name: {'calls': calls, 'seconds': round(seconds, 6)}
+                       for name, (calls, seconds) in sorted(self._timings.items())}
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'latency_ms': self.latency * 1000,
+            'jitter_ms': self.jitter * 1000,
+            'methods': methods
+        }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._timings.clear()
+
+    def pool_stats(self) -> Dict:
+        """No connection pool for the embedded backend"""
+        return {'pid': os.getpid(), 'backend': 'sqlite'}
+
+    @staticmethod
+    def _rows(cursor) -> List[Dict]:
+        return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _meeting(row: Dict) -> Dict:
+        row['is_template'] = bool(row['is_template'])
+        return row
+
+    # Contact Management
+    def get_contacts(self, member_type: Optional[str] = None) -> List[Dict]:
+        """Get all contacts, optionally filtered by member type"""
+        with self._round_trip('get_contacts') as conn:
+            if member_type:
+                return self._rows(conn.execute('SELECT * FROM contacts WHERE member_type = ?', (member_type,)))
+            return self._rows(conn.execute('SELECT * FROM contacts'))
+
+    def get_internal_members(self) -> List[Dict]:
+        """Get all internal members"""
+        return self.get_contacts('internal')
+
+    def get_external_contacts(self) -> List[Dict]:
+        """Get all external contacts"""
+        return self.get_contacts('external')
+
+    def add_contact(self, email: str, name: str, member_type: str = 'external',
+                    organization_id: Optional[str] = None) -> Dict:
+        """Add a new contact"""
+        return self._insert_contact('add_contact', {
+            'email': email,
+            'name': name,
+            'member_type': member_type,
+            'organization_id': organization_id,
+            'status': None
+        })
+
+    def _insert_contact(self, name: str, contact: Dict) -> Dict:
+        row = dict(contact, id=_new_id(), created_at=_now())
+        with self._round_trip(name, write=True) as conn:
+            conn.execute(
+                'INSERT INTO contacts (id, email, name, member_type, organization_id, status, created_at) '
+                'VALUES (:id, :email, :name, :member_type, :organization_id, :status, :created_at)', row
+            )
+        return row
+
+    def update_contact(self, contact_id: str, **kwargs) -> Dict:
+        """Update a contact"""
+        return self._update('update_contact', 'contacts', contact_id, kwargs)
+
+    def delete_contact(self, contact_id: str) -> bool:
+        """Delete a contact"""
+        with self._round_trip('delete_contact', write=True) as conn:
+            return conn.execute('DELETE FROM contacts WHERE id = ?', (contact_id,)).rowcount > 0
+
+    def _update(self, name: str, table: str, row_id: str, values: Dict) -> Optional[Dict]:
+        with self._round_trip(name, write=True) as conn:
+            if values:
+                assignments = ', '.join(f'{column} = ?' for column in values)
+                conn.execute(f'UPDATE {table} SET {assignments} WHERE id = ?', (*values.values(), row_id))
+            row = conn.execute(f'SELECT * FROM {table} WHERE id = ?', (row_id,)).fetchone()
+        return dict(row) if row else None
+
+    # Meeting Management
+    def get_meetings(self, organization_id: Optional[str] = None) -> List[Dict]:
+        """Get all meetings, optionally filtered by organization"""
+        with self._round_trip('get_meetings') as conn:
+            if organization_id:
+                rows = self._rows(conn.execute('SELECT * FROM meetings WHERE organization_id = ?', (organization_id,)))
+            else:
+                rows = self._rows(conn.execute('SELECT * FROM meetings'))
+        return [self._meeting(row) for row in rows]
+
+    def get_meeting(self, meeting_id: str) -> Optional[Dict]:
+        """Get a specific meeting"""
+        with self._round_trip('get_meeting') as conn:
+            row = conn.execute('SELECT * FROM meetings WHERE id = ?', (meeting_id,)).fetchone()
+        return self._meeting(dict(row)) if row else None
+
+    def get_meeting_with_attendees(self, meeting_id: str, after: Optional[str] = None,
+                                   limit: Optional[int] = None) -> Optional[Dict]:
+        """Get meeting details with one keyset page of attendees"""
+        meeting = self.get_meeting(meeting_id)
+        if not meeting:
+            return None
+
+        page = self.get_meeting_recipients(meeting_id, after=after, limit=limit)
+        meeting['attendees'] = page['recipients']
+        meeting['attendees_next_cursor'] = page['next_cursor']
+        return meeting
+
+    def get_meeting_recipients(self, meeting_id: str, after: Optional[str] = None,
+                               limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of a meeting's unique recipients, newest first"""
+        condition, params = _keyset(after)
+        sql = f'SELECT id, recipient, created_at FROM meeting_recipients WHERE meeting_id = ?{condition} ORDER BY created_at DESC, id DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._round_trip('get_meeting_recipients') as conn:
+            rows = self._rows(conn.execute(sql, (meeting_id, *params)))
+        for row in rows:
+            row['recipient'] = json.loads(row['recipient'])
+        return _recipients_page(rows, limit)
+
+    def add_meeting_recipients(self, meeting_id: str, recipients: List[Dict]) -> None:
+        """Record recipients of a meeting with set semantics"""
+        rows = _recipient_rows(meeting_id, recipients)
+        if not rows:
+            return
+        with self._round_trip('add_meeting_recipients', write=True) as conn:
+            self._insert_recipients(conn, rows)
+
+    @staticmethod
+    def _insert_recipients(conn, rows: List[Dict]) -> None:
+        created_at = _now()
+        conn.executemany(
+            'INSERT OR IGNORE INTO meeting_recipients (id, meeting_id, recipient_key, recipient, created_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [(_new_id(), row['meeting_id'], row['recipient_key'], json.dumps(row['recipient']), created_at)
+             for row in rows]
+        )
+
+    def get_upcoming_meetings(self, organization_id: Optional[str] = None) -> List[Dict]:
+        """Get upcoming meetings"""
+        sql = 'SELECT * FROM meetings WHERE scheduled_at >= ?'
+        params = [_now()]
+        if organization_id:
+            sql += ' AND organization_id = ?'
+            params.append(organization_id)
+        with self._round_trip('get_upcoming_meetings') as conn:
+            rows = self._rows(conn.execute(sql + ' ORDER BY scheduled_at', params))
+        return [self._meeting(row) for row in rows]
+
+    def create_meeting(self, organization_id: str, meeting_code: str, title: str,
+                       scheduled_at: str, duration_mins: int = 30, description: str = None) -> Dict:
+        """Create a new meeting"""
+        row = {
+            'id': _new_id(),
+            'organization_id': organization_id,
+            'meeting_code': meeting_code,
+            'title': title,
+            'scheduled_at': scheduled_at,
+            'duration_mins': duration_mins,
+            'description': description,
+            'is_template': False,
+            'template_type': None,
+            'created_at': _now(),
+            'updated_at': None
+        }
+        with self._round_trip('create_meeting', write=True) as conn:
+            self._insert_meeting(conn, row)
+        return row
+
+    @staticmethod
+    def _insert_meeting(conn, row: Dict) -> None:
+        conn.execute(
+            'INSERT INTO meetings (id, organization_id, meeting_code, title, scheduled_at, duration_mins, '
+            'description, is_template, template_type, created_at, updated_at) '
+            'VALUES (:id, :organization_id, :meeting_code, :title, :scheduled_at, :duration_mins, '
+            ':description, :is_template, :template_type, :created_at, :updated_at)', row
+        )
+
+    @staticmethod
+    def _store_body(conn, row: Dict) -> None:
+        """Insert a body unless stored already; the meeting_minutes triggers count references"""
+        conn.execute('INSERT INTO template_bodies (digest, body, encoding, size) VALUES '
+                     '(:digest, :body, :encoding, :size) ON CONFLICT (digest) DO NOTHING', row)
+
+    @staticmethod
+    def _bodies(conn, meetings: List[Dict]) -> Dict[str, str]:
+        """Stored bodies of the templates in meetings; only uncached ones are read"""
+        bodies, missing = cached_bodies(_body_digests(meetings))
+        if missing:
+            rows = conn.execute('SELECT digest, body, encoding FROM template_bodies WHERE digest IN '
+                                f"({', '.join('?' * len(missing))})", missing)
+            bodies.update(remember_bodies(dict(row) for row in rows))
+        return bodies
+
+    def update_meeting(self, meeting_id: str, **kwargs) -> Dict:
+        """Update a meeting"""
+        meeting = self._update('update_meeting', 'meetings', meeting_id, kwargs)
+        return self._meeting(meeting) if meeting else None
+
+    def delete_meeting(self, meeting_id: str) -> bool:
+        """Delete a meeting"""
+        with self._round_trip('delete_meeting', write=True) as conn:
+            return conn.execute('DELETE FROM meetings WHERE id = ?', (meeting_id,)).rowcount > 0
+
+    # Template Management (mapped to meetings and meeting_minutes)
+    def create_template(self, user_id: str, title: str, content: str, **kwargs) -> Dict:
+        """Create a new template (stored as meeting with minutes)"""
+        created = self.create_templates([dict(kwargs, user_id=user_id, title=title, content=content)])
+        return created[0] if created else None
+
+    def create_templates(self, templates: List[Dict]) -> List[Dict]:
+        """Create several templates in one transaction"""
+        if not templates:
+            return []
+
+        rows = []
+        with self._round_trip('create_templates', write=True) as conn:
+            for item in _template_payload(templates):
+                created_at = _now()
+                meeting = {
+                    'id': _new_id(),
+                    'organization_id': None,
+                    'meeting_code': item['meeting_code'],
+                    'title': item['title'],
+                    'scheduled_at': item['scheduled_at'],
+                    'duration_mins': item['duration_mins'],
+                    'description': item['description'],
+                    'is_template': True,
+                    'template_type': 'meeting',
+                    'created_at': created_at,
+                    'updated_at': None
+                }
+                self._insert_meeting(conn, meeting)
+                if item['body']:
+                    self._store_body(conn, item['body'])
+                conn.execute(
+                    'INSERT INTO meeting_minutes (id, meeting_id, summary, full_mom, meeting_type, template_params, '
+                    'template_version, body_digest, created_by, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (_new_id(), meeting['id'], item['summary'], item['full_mom'], item['meeting_type'],
+                     json.dumps(item['template_params']) if item['template_params'] else None,
+                     item['template_version'], item['body']['digest'] if item['body'] else None,
+                     item['created_by'], created_at)
+                )
+                rows.append({'id': meeting['id']})
+        return _created_templates(rows, templates)
+
+    _TEMPLATE_SELECT = (
+        'SELECT m.*, mm.summary, mm.full_mom, mm.meeting_type, mm.template_params, mm.template_version, '
+        'mm.body_digest, mm.created_by FROM meetings m '
+        'JOIN meeting_minutes mm ON mm.meeting_id = m.id WHERE m.is_template = 1'
+    )
+
+    @staticmethod
+    def _embed_minutes(row: Dict) -> Dict:
+        """Reshape a joined row like PostgREST's meeting_minutes embed"""
+        row['meeting_minutes'] = {
+            'summary': row.pop('summary'),
+            'full_mom': row.pop('full_mom'),
+            'meeting_type': row.pop('meeting_type'),
+            'template_params': row.pop('template_params'),
+            'template_version': row.pop('template_version'),
+            'body_digest': row.pop('body_digest'),
+            'created_by': row.pop('created_by')
+        }
+        return row
+
+    def get_templates(self, user_id: Optional[str] = None) -> List[Dict]:
+        """Get templates (meetings with is_template=True)"""
+        with self._round_trip('get_templates') as conn:
+            if user_id:
+                rows = self._rows(conn.execute(self._TEMPLATE_SELECT + ' AND mm.created_by = ?', (user_id,)))
+            else:
+                rows = self._rows(conn.execute(self._TEMPLATE_SELECT))
+            meetings = [self._embed_minutes(row) for row in rows]
+            bodies = self._bodies(conn, meetings)
+        return [_template_from_meeting(meeting, bodies) for meeting in meetings]
+
+    def get_template_listing(self, user_id: str, after: Optional[str] = None,
+                             limit: int = 20) -> Dict:
+        """Get one keyset page of a user's templates, newest first, without full_mom"""
+        condition, params = _keyset(after, 'm.')
+        sql = ('SELECT m.id, m.title, m.scheduled_at, m.created_at FROM meetings m '
+               'JOIN meeting_minutes mm ON mm.meeting_id = m.id '
+               f'WHERE m.is_template = 1 AND mm.created_by = ?{condition} '
+               f'ORDER BY m.created_at DESC, m.id DESC LIMIT {int(limit)}')
+        with self._round_trip('get_template_listing') as conn:
+            rows = self._rows(conn.execute(sql, (user_id, *params)))
+        return _template_listing_page(rows, user_id, limit)
+
+    def count_templates(self, user_id: Optional[str] = None) -> int:
+        """Count templates"""
+        with self._round_trip('count_templates') as conn:
+            if user_id:
+                row = conn.execute('SELECT COUNT(*) FROM meetings m JOIN meeting_minutes mm ON mm.meeting_id = m.id '
+                                   'WHERE m.is_template = 1 AND mm.created_by = ?', (user_id,)).fetchone()
+            else:
+                row = conn.execute('SELECT COUNT(*) FROM meetings WHERE is_template = 1').fetchone()
+        return row[0]
+
+    def get_template(self, template_id: str) -> Optional[Dict]:
+        """Get a specific template"""
+        with self._round_trip('get_template') as conn:
+            row = conn.execute(self._TEMPLATE_SELECT + ' AND m.id = ?', (template_id,)).fetchone()
+            if row is None:
+                return None
+            meeting = self._embed_minutes(dict(row))
+            bodies = self._bodies(conn, [meeting])
+        return _template_from_meeting(meeting, bodies)
+
+    def update_template(self, template_id: str, **kwargs) -> Dict:
+        """Update a template"""
+        meeting_updates, minutes_updates, body = _template_updates(kwargs)
+        with self._round_trip('update_template', write=True) as conn:
+            if body:
+                self._store_body(conn, body)
+            for table, key, values in (('meetings', 'id', meeting_updates),
+                                       ('meeting_minutes', 'meeting_id', minutes_updates)):
+                if values:
+                    assignments = ', '.join(f'{column} = ?' for column in values)
+                    conn.execute(f'UPDATE {table} SET {assignments} WHERE {key} = ?', (*values.values(), template_id))
+        return self.get_template(template_id)
+
+    def delete_template(self, template_id: str) -> bool:
+        """Delete a template"""
+        with self._round_trip('delete_template', write=True) as conn:
+            # The delete trigger drops the stored body with its last reference
+            conn.execute('DELETE FROM meeting_minutes WHERE meeting_id = ?', (template_id,))
+            return conn.execute('DELETE FROM meetings WHERE id = ?', (template_id,)).rowcount > 0
+
+    # Distribution Management
+    def create_distribution(self, user_id: str, template_id: str, method: str,
+                            recipients: List[str], **kwargs) -> Dict:
+        """Create a new distribution record"""
+        created_at = _now()
+        post = dict(_distribution_record(template_id, method, kwargs),
+                    id=_new_id(), created_at=created_at, updated_at=created_at)
+        with self._round_trip('create_distribution', write=True) as conn:
+            conn.execute(
+                'INSERT INTO social_posts (id, meeting_id, platforms, status, published_at, created_at, updated_at) '
+                'VALUES (:id, :meeting_id, :platforms, :status, :published_at, :created_at, :updated_at)', post
+            )
+            try:
+                recipients_list = _distribution_recipients(kwargs)
+                if recipients_list:
+                    self._insert_recipients(conn, _recipient_rows(template_id, recipients_list))
+            except Exception as e:
+                print(f"Error storing recipients: {e}")
+        return post
+
+    def get_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                          method: Optional[str] = None, after: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict]:
+        """Get distributions with recipients, newest first"""
+        return self.get_distributions_page(user_id, status=status, method=method,
+                                           after=after, limit=limit)['distributions']
+
+    @staticmethod
+    def _distribution_where(user_id: Optional[str], status: Optional[str], method: Optional[str]) -> tuple:
+        sql = ' WHERE 1 = 1'
+        params = []
+        if user_id:
+            sql += ' AND mm.created_by = ?'
+            params.append(user_id)
+        if status:
+            sql += ' AND p.status = ?'
+            params.append(status)
+        if method:
+            sql += ' AND p.platforms = ?'
+            params.append(json.dumps([method]))
+        return sql, params
+
+    def get_distributions_page(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                               method: Optional[str] = None, after: Optional[str] = None,
+                               limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of distributions plus the cursor for the next page"""
+        where, params = self._distribution_where(user_id, status, method)
+        condition, keyset_params = _keyset(after, 'p.')
+        sql = ('SELECT p.*, mm.created_by FROM social_posts p '
+               'LEFT JOIN meeting_minutes mm ON mm.meeting_id = p.meeting_id'
+               f'{where}{condition} ORDER BY p.created_at DESC, p.id DESC')
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+
+        with self._round_trip('get_distributions_page') as conn:
+            posts = self._rows(conn.execute(sql, (*params, *keyset_params)))
+            meeting_ids = list({post['meeting_id'] for post in posts})
+            recipients = defaultdict(list)
+            if meeting_ids:
+                placeholders = ', '.join('?' for _ in meeting_ids)
+                for row in conn.execute(f'SELECT meeting_id, recipient FROM meeting_recipients '
+                                        f'WHERE meeting_id IN ({placeholders})', meeting_ids):
+                    recipients[row['meeting_id']].append({'recipient': json.loads(row['recipient'])})
+
+        # Same shape as the PostgREST embed so the shared mapper applies
+        for post in posts:
+            created_by = post.pop('created_by')
+            post['meetings'] = {
+                'meeting_minutes': {'created_by': created_by} if created_by else None,
+                'meeting_recipients': recipients[post['meeting_id']]
+            }
+        return _distributions_page(posts, limit)
+
+    def count_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                            method: Optional[str] = None) -> int:
+        """Count distributions"""
+        where, params = self._distribution_where(user_id, status, method)
+        with self._round_trip('count_distributions') as conn:
+            row = conn.execute('SELECT COUNT(*) FROM social_posts p '
+                               'LEFT JOIN meeting_minutes mm ON mm.meeting_id = p.meeting_id' + where, params).fetchone()
+        return row[0]
+
+    def update_distribution_status(self, distribution_id: str, status: str, **kwargs) -> Dict:
+        """Update distribution status"""
+        update_data = {'status': status, 'updated_at': _now()}
+        if status == 'sent':
+            update_data['published_at'] = update_data['updated_at']
+        return self._update('update_distribution_status', 'social_posts', distribution_id, update_data)
+
+    # User Management (mapped to contacts)
+    def create_user(self, username: str, email: str, password_hash: str) -> Dict:
+        """Create a new user (stored as contact)"""
+        return self._insert_contact('create_user', {
+            'email': email,
+            'name': username,
+            'member_type': 'internal',
+            'organization_id': None,
+            'status': 'active'
+        })
+
+    def _get_user_where(self, name: str, column: str, value: str) -> Optional[Dict]:
+        with self._round_trip(name) as conn:
+            row = conn.execute(f'SELECT * FROM contacts WHERE {column} = ?', (value,)).fetchone()
+        return _user_from_contact(dict(row)) if row else None
+
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        """Get user by email"""
+        return self._get_user_where('get_user_by_email', 'email', email)
+
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Get user by username (name in contacts)"""
+        return self._get_user_where('get_user_by_username', 'name', username)
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        return self._get_user_where('get_user', 'id', user_id)
+
+    # Organization Management
+    def get_organizations(self) -> List[Dict]:
+        """Get all organizations"""
+        with self._round_trip('get_organizations') as conn:
+            return self._rows(conn.execute('SELECT * FROM organizations'))
+
+    def get_organization(self, organization_id: str) -> Optional[Dict]:
+        """Get a specific organization"""
+        with self._round_trip('get_organization') as conn:
+            row = conn.execute('SELECT * FROM organizations WHERE id = ?', (organization_id,)).fetchone()
+        return dict(row) if row else None
+
+    def create_organization(self, name: str, domain: str = None) -> Dict:
+        """Create a new organization"""
+        row = {'id': _new_id(), 'name': name, 'domain': domain, 'created_at': _now()}
+        with self._round_trip('create_organization', write=True) as conn:
+            conn.execute('INSERT INTO organizations (id, name, domain, created_at) '
+                         'VALUES (:id, :name, :domain, :created_at)', row)
+        return row
+
+    # Demo data initialization
+    def initialize_demo_contacts(self):
+        """Initialize demo contacts for testing"""
+        with self._round_trip('initialize_demo_contacts', write=True) as conn:
+            org = conn.execute("SELECT id FROM organizations WHERE name = 'Demo Company'").fetchone()
+            if org:
+                organization_id = org['id']
+            else:
+                organization_id = _new_id()
+                conn.execute('INSERT INTO organizations (id, name, domain, created_at) VALUES (?, ?, ?, ?)',
+                             (organization_id, 'Demo Company', 'demo.com', _now()))
+
+            conn.executemany(
+                'INSERT OR IGNORE INTO contacts (id, email, name, member_type, organization_id, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(_new_id(), c['email'], c['name'], c['member_type'], c['organization_id'], _now())
+                 for c in _demo_contacts(organization_id)]
+            )
+
+    def ensure_database_schema(self):
+        """Ensure all required tables exist"""
+        with self._round_trip('ensure_database_schema') as conn:
+            _migrate(conn)
+        print("Database schema is up to date")
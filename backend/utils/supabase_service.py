@@ -1,19 +1,399 @@
 from supabase import create_client, Client
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import json
 from datetime import datetime, date
 from config import config
+from utils.cache import TTLCache
+from utils.http_pool import HTTPPool
+from utils.body_store import body_row, cached_bodies, remember_bodies
+from utils.template_generator import template_generator
 import os
+import base64
+import logging
+import re
+import threading
+
+logger = logging.getLogger('smartmeeting.storage')
+
+def encode_cursor(row: Dict) -> str:
+    """Encode the (created_at, id) position of a row as an opaque keyset cursor"""
+    raw = json.dumps([row['created_at'], row['id']])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, row_id
+
+def _apply_keyset(query, after: Optional[str] = None):
+    """Order newest first and, given a cursor, continue strictly after it"""
+    if after:
+        created_at, row_id = decode_cursor(after)
+        # created_at is not unique, so ties are broken on id; values are quoted
+        # because timestamps contain reserved characters ('.', ':')
+        query.params = query.params.add(
+            'or', f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{row_id}"))'
+        )
+    # One order parameter: PostgREST keeps only one of repeated order=
+    # parameters, which would drop the id tie-break the cursor relies on
+    query.params = query.params.add('order', 'created_at.desc,id.desc')
+    return query
+
+def _recipient_key(recipient: Dict) -> Optional[str]:
+    """Normalized identity of a recipient, matching the SQL backfill in SUPABASE_MIGRATION.md"""
+    email = (recipient.get('email') or '').strip()
+    if email:
+        return 'email:' + email.lower()
+    if recipient.get('phone'):
+        return 'phone:' + re.sub(r'\D', '', recipient['phone'])
+    return None
+
+def _first(embedded):
+    """Embedded resources come back as a dict or a list depending on the relationship"""
+    if isinstance(embedded, list):
+        return embedded[0] if embedded else None
+    return embedded
+
+def _demo_contacts(organization_id: Optional[str]) -> List[Dict]:
+    """Demo contacts seeded for testing"""
+    return [
+        # Internal members
+        {'email': 'john.doe@company.com', 'name': 'John Doe', 'member_type': 'internal', 'organization_id': organization_id},
+        {'email': 'jane.smith@company.com', 'name': 'Jane Smith', 'member_type': 'internal', 'organization_id': organization_id},
+        {'email': 'mike.johnson@company.com', 'name': 'Mike Johnson', 'member_type': 'internal', 'organization_id': organization_id},
+        {'email': 'sarah.wilson@company.com', 'name': 'Sarah Wilson', 'member_type': 'internal', 'organization_id': organization_id},
+        {'email': 'david.brown@company.com', 'name': 'David Brown', 'member_type': 'internal', 'organization_id': organization_id},
+        
+        # External contacts
+        {'email': 'client1@external.com', 'name': 'Client One', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'client2@external.com', 'name': 'Client Two', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'partner1@partner.com', 'name': 'Partner One', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'partner2@partner.com', 'name': 'Partner Two', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'vendor1@vendor.com', 'name': 'Vendor One', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'consultant@consulting.com', 'name': 'External Consultant', 'member_type': 'external', 'organization_id': organization_id},
+        {'email': 'investor@investments.com', 'name': 'Investor Contact', 'member_type': 'external', 'organization_id': organization_id},
+    ]
+
+# Query builders and row mappers shared by SupabaseService and
+# AsyncSupabaseService; the sync and async PostgREST builders have the same
+# filter API, so only execute() differs between the two.
+
+def _page(query, after: Optional[str], limit: Optional[int]):
+    query = _apply_keyset(query, after)
+    return query.limit(limit) if limit else query
+
+def _next_cursor(rows: List[Dict], limit: Optional[int]) -> Optional[str]:
+    return encode_cursor(rows[-1]) if limit and len(rows) == limit else None
+
+def _user_from_contact(contact: Dict) -> Dict:
+    return {
+        'id': contact['id'],
+        'username': contact['name'],
+        'email': contact['email'],
+        'password_hash': 'hashed_password',  # We'll need to handle this differently
+        'created_at': contact['created_at']
+    }
+
+def _recipients_query(table, meeting_id: str, after: Optional[str], limit: Optional[int]):
+    return _page(table.select('id, recipient, created_at').eq('meeting_id', meeting_id), after, limit)
+
+def _recipients_page(rows: List[Dict], limit: Optional[int]) -> Dict:
+    return {'recipients': [row['recipient'] for row in rows], 'next_cursor': _next_cursor(rows, limit)}
+
+def _recipient_rows(meeting_id: str, recipients: List[Dict]) -> List[Dict]:
+    """One row per unique recipient, ready for the meeting_recipients upsert"""
+    rows = {}
+    for recipient in recipients:
+        key = _recipient_key(recipient)
+        if key:
+            rows.setdefault(key, {'meeting_id': meeting_id, 'recipient_key': key, 'recipient': recipient})
+    return list(rows.values())
+
+def _template_payload(templates: List[Dict]) -> List[Dict]:
+    """Arguments for the create_templates Postgres function"""
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    payload = []
+    for index, template in enumerate(templates):
+        details = {k: v for k, v in template.items() if k not in ('user_id', 'title', 'content')}
+        duration = details.get('duration', 30)
+        payload.append({
+            'meeting_code': f"TEMPLATE_{timestamp}" if len(templates) == 1 else f"TEMPLATE_{timestamp}_{index}",
+            'title': template['title'],
+            'scheduled_at': details.get('meeting_date', datetime.utcnow().isoformat()),
+            'duration_mins': int(duration.split()[0]) if isinstance(duration, str) else duration,
+            'description': details.get('additional_notes', ''),
+            'summary': details.get('additional_notes', ''),
+            # Templates generated from parameters store those instead of the
+            # rendered HTML; _template_from_meeting renders them on read.
+            # Other content goes to template_bodies, once per distinct body.
+            'full_mom': None,
+            'body': None if details.get('template_params') else body_row(template['content']),
+            'meeting_type': details.get('meeting_type'),
+            'template_params': details.get('template_params'),
+            'template_version': details.get('template_version'),
+            'created_by': template['user_id']
+        })
+    return payload
+
+def _minutes_columns(item: Dict) -> Dict:
+    """The template_params or body_digest columns of a payload item"""
+    if item['body']:
+        return {'body_digest': item['body']['digest']}
+    return {name: item[name] for name in ('meeting_type', 'template_params', 'template_version')}
+
+def _template_meeting_rows(payload: List[Dict]) -> List[Dict]:
+    """meetings rows of a create_templates payload, for the non-RPC fallback"""
+    return [{
+        'organization_id': None,
+        'meeting_code': item['meeting_code'],
+        'title': item['title'],
+        'scheduled_at': item['scheduled_at'],
+        'duration_mins': item['duration_mins'],
+        'description': item['description'],
+        'is_template': True,
+        'template_type': 'meeting'
+    } for item in payload]
+
+def _template_minutes_rows(meetings: List[Dict], payload: List[Dict]) -> List[Dict]:
+    """meeting_minutes rows for the meetings inserted from payload, in order"""
+    return [{
+        'meeting_id': meeting['id'],
+        'summary': item['summary'],
+        'full_mom': item['full_mom'],
+        'created_by': item['created_by'],
+        **_minutes_columns(item)
+    } for meeting, item in zip(meetings, payload)]
+
+def _created_templates(rows: List[Dict], templates: List[Dict]) -> List[Dict]:
+    # Return combined data
+    return [{
+        'id': row['id'],
+        'title': template['title'],
+        'content': template['content'],
+        'user_id': template['user_id'],
+        **{k: v for k, v in template.items() if k not in ('id', 'title', 'content', 'user_id')}
+    } for row, template in zip(rows, templates)]
+
+# Template details only kept in meeting_minutes.template_params
+_TEMPLATE_PARAM_FIELDS = ('speaker_name', 'meeting_time', 'meeting_link', 'location', 'attendees', 'priority')
+
+def _body_digests(meetings: List[Dict]) -> List[str]:
+    """Digests of the stored bodies the templates in meetings reference"""
+    minutes = (_first(meeting.get('meeting_minutes')) for meeting in meetings)
+    return [m['body_digest'] for m in minutes if m and m.get('body_digest')]
+
+def _template_from_meeting(meeting: Dict, bodies: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+    minutes = _first(meeting.get('meeting_minutes'))
+    if not minutes:
+        return None
+    digest = minutes.get('body_digest')
+    template = {
+        'id': meeting['id'],
+        'title': meeting['title'],
+        'content': minutes.get('full_mom') or (bodies or {}).get(digest) or '',
+        'user_id': minutes.get('created_by'),
+        'meeting_topic': meeting['title'],
+        'meeting_date': meeting['scheduled_at'],
+        'duration': f"{meeting['duration_mins']} minutes",
+        'additional_notes': minutes.get('summary', '')
+    }
+    params = minutes.get('template_params')
+    if isinstance(params, str):
+        params = json.loads(params)
+    if params:
+        # Stored content (legacy rows, edited content) wins over the parameters
+        if not template['content']:
+            try:
+                template['content'] = template_generator.render_saved(
+                    minutes['meeting_type'], params, minutes.get('template_version') or 1)
+            except ValueError as e:
+                # An unknown layout or version must not fail a whole listing;
+                # the template comes back without content
+                logger.warning("Cannot render template %s: %s", meeting['id'], e)
+        template.update({name: params[name] for name in _TEMPLATE_PARAM_FIELDS if name in params})
+        template['meeting_type'] = minutes['meeting_type']
+    return template
+
+def _templates_query(table, user_id: Optional[str]):
+    # Query meetings that are templates; the inner join lets PostgREST
+    # filter on the owning user without a separate id lookup
+    if user_id:
+        return table.select('*, meeting_minutes!inner(*)').eq('is_template', True).eq('meeting_minutes.created_by', user_id)
+    return table.select('*, meeting_minutes(*)').eq('is_template', True)
+
+def _template_listing_query(table, user_id: str, after: Optional[str], limit: int):
+    query = table.select(
+        'id, title, scheduled_at, created_at, meeting_minutes!inner(created_by)'
+    ).eq('is_template', True).eq('meeting_minutes.created_by', user_id)
+    return _page(query, after, limit)
+
+def _template_listing_page(rows: List[Dict], user_id: str, limit: int) -> Dict:
+    templates = [{
+        'id': meeting['id'],
+        'title': meeting['title'],
+        'meeting_topic': meeting['title'],
+        'meeting_date': meeting['scheduled_at'],
+        'created_at': meeting['created_at'],
+        'user_id': user_id
+    } for meeting in rows]
+    return {'templates': templates, 'next_cursor': _next_cursor(rows, limit)}
+
+def _count_templates_query(table, user_id: Optional[str], count_method: str):
+    if user_id:
+        query = table.select('id, meeting_minutes!inner(created_by)', count=count_method)
+        query = query.eq('meeting_minutes.created_by', user_id)
+    else:
+        query = table.select('id', count=count_method)
+    # Only the Content-Range total is needed; one id row comes back at most
+    return query.eq('is_template', True).limit(1)
+
+def _template_updates(kwargs: Dict) -> Tuple[Dict, Dict, Optional[Dict]]:
+    """Split template fields into meetings and meeting_minutes updates
+    
+    New content also returns its template_bodies row, which has to be
+    stored before the minutes reference it.
+    """
+    meeting_updates = {}
+    if 'title' in kwargs:
+        meeting_updates['title'] = kwargs['title']
+    if 'meeting_date' in kwargs:
+        meeting_updates['scheduled_at'] = kwargs['meeting_date']
+    if 'duration' in kwargs:
+        duration_str = kwargs['duration']
+        if isinstance(duration_str, str) and 'minutes' in duration_str:
+            meeting_updates['duration_mins'] = int(duration_str.split()[0])
+    
+    minutes_updates = {}
+    body = None
+    if 'content' in kwargs:
+        body = body_row(kwargs['content'])
+        minutes_updates['full_mom'] = None
+        minutes_updates['body_digest'] = body['digest']
+    if 'additional_notes' in kwargs:
+        minutes_updates['summary'] = kwargs['additional_notes']
+    
+    return meeting_updates, minutes_updates, body
+
+def _distribution_filters(query, user_id: Optional[str], status: Optional[str], method: Optional[str]):
+    if user_id:
+        query = query.eq('meetings.meeting_minutes.created_by', user_id)
+    if status:
+        query = query.eq('status', status)
+    if method:
+        query = query.eq('platforms', json.dumps([method]))
+    return query
+
+def _distributions_query(table, user_id: Optional[str], status: Optional[str], method: Optional[str],
+                         after: Optional[str], limit: Optional[int]):
+    # Inner joins let PostgREST drop posts owned by other users server-side
+    join = '!inner' if user_id else ''
+    query = table.select(
+        f'*, meetings{join}(meeting_minutes{join}(created_by), meeting_recipients(recipient))'
+    )
+    return _page(_distribution_filters(query, user_id, status, method), after, limit)
+
+def _distributions_page(posts: List[Dict], limit: Optional[int]) -> Dict:
+    distributions = []
+    for post in posts:
+        meeting = post.get('meetings') or {}
+        minutes = _first(meeting.get('meeting_minutes'))
+        recipients = [row['recipient'] for row in meeting.get('meeting_recipients') or []]
+        
+        distributions.append({
+            'id': post['id'],
+            'template_id': post['meeting_id'],
+            'method': json.loads(post['platforms'])[0] if post['platforms'] else 'unknown',
+            'recipients': json.dumps(recipients),
+            'status': post['status'],
+            'sent_at': post['published_at'],
+            'created_at': post['created_at'],
+            'updated_at': post['updated_at'],
+            'user_id': minutes.get('created_by') if minutes else None
+        })
+    
+    return {'distributions': distributions, 'next_cursor': _next_cursor(posts, limit)}
+
+def _count_distributions_query(table, user_id: Optional[str], status: Optional[str],
+                               method: Optional[str], count_method: str):
+    if user_id:
+        query = table.select('id, meetings!inner(meeting_minutes!inner(created_by))', count=count_method)
+    else:
+        query = table.select('id', count=count_method)
+    return _distribution_filters(query, user_id, status, method).limit(1)
+
+def _distribution_record(template_id: str, method: str, kwargs: Dict) -> Dict:
+    return {
+        'meeting_id': template_id,
+        'platforms': json.dumps([method]),
+        'status': kwargs.get('status', 'pending'),
+        'published_at': kwargs.get('sent_at') if kwargs.get('status') == 'sent' else None
+    }
+
+def _distribution_recipients(kwargs: Dict) -> List[Dict]:
+    recipients_data = kwargs.get('formatted_recipients')
+    if not recipients_data:
+        return []
+    return json.loads(recipients_data) if isinstance(recipients_data, str) else recipients_data
 
 class SupabaseService:
     def __init__(self):
         config_name = os.environ.get('FLASK_ENV', 'production')
         app_config = config[config_name]
+        self.app_config = app_config
+        
+        # The client is built lazily, once per process: sockets inherited
+        # across fork() must never be used by two workers
+        self._client: Optional[Client] = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+        self.http_pool = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
         
-        self.supabase: Client = create_client(
-            app_config.SUPABASE_URL,
-            app_config.SUPABASE_ANON_KEY
+        # Dashboard counters are read far more often than they change
+        self.count_method = app_config.COUNT_METHOD
+        self._count_cache = TTLCache(maxsize=1024, ttl=app_config.COUNT_CACHE_TTL)
+    
+    @property
+    def supabase(self) -> Client:
+        """The Supabase client for the current process, with a pooled keep-alive transport"""
+        if self._client is None or self._client_pid != os.getpid():
+            with self._client_lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    self._client = self._create_client()
+                    self._client_pid = os.getpid()
+        return self._client
+    
+    def _create_client(self) -> Client:
+        self.http_pool = HTTPPool(self.app_config)
+        client = create_client(
+            self.app_config.SUPABASE_URL,
+            self.app_config.SUPABASE_ANON_KEY
         )
+        # supabase-py rebuilds its PostgREST client on auth events; route
+        # every (re)build through the pool
+        client._init_postgrest_client = self.http_pool.create_postgrest_client
+        return client
+    
+    def connect(self) -> Client:
+        """Build this process's client now instead of on the first request"""
+        return self.supabase
+    
+    def _reset_after_fork(self):
+        """Forget the parent's client without closing its shared sockets"""
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+        self.http_pool = None
+    
+    def pool_stats(self) -> Dict:
+        """Connection pool statistics for this worker process"""
+        if self.http_pool is None or self._client_pid != os.getpid():
+            return {'pid': os.getpid(), 'initialized': False}
+        return self.http_pool.stats()
     
     # Contact Management
     def get_contacts(self, member_type: Optional[str] = None) -> List[Dict]:
@@ -73,8 +453,9 @@ class SupabaseService:
         response = self.supabase.table('meetings').select('*').eq('id', meeting_id).execute()
         return response.data[0] if response.data else None
     
-    def get_meeting_with_attendees(self, meeting_id: str) -> Optional[Dict]:
-        """Get meeting details with attendee information"""
+    def get_meeting_with_attendees(self, meeting_id: str, after: Optional[str] = None,
+                                   limit: Optional[int] = None) -> Optional[Dict]:
+        """Get meeting details with one keyset page of attendees"""
         # Get meeting details
         meeting_response = self.supabase.table('meetings').select('*').eq('id', meeting_id).execute()
         if not meeting_response.data:
@@ -83,12 +464,34 @@ class SupabaseService:
         meeting = meeting_response.data[0]
         
         # Get attendees
-        attendees_response = self.supabase.table('meeting_attendees').select('attendees').eq('meeting_id', meeting_id).execute()
-        attendees = attendees_response.data[0]['attendees'] if attendees_response.data else []
-        
-        meeting['attendees'] = attendees
+        page = self.get_meeting_recipients(meeting_id, after=after, limit=limit)
+        meeting['attendees'] = page['recipients']
+        meeting['attendees_next_cursor'] = page['next_cursor']
         return meeting
     
+    def get_meeting_recipients(self, meeting_id: str, after: Optional[str] = None,
+                               limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of a meeting's unique recipients, newest first"""
+        query = _recipients_query(self.supabase.table('meeting_recipients'), meeting_id, after, limit)
+        response = query.execute()
+        return _recipients_page(response.data or [], limit)
+    
+    def add_meeting_recipients(self, meeting_id: str, recipients: List[Dict]) -> None:
+        """Record recipients of a meeting with set semantics
+        
+        One row per (meeting, recipient); the upsert ignores rows that already
+        exist, so resends don't grow the table and concurrent sends can't
+        overwrite each other.
+        """
+        rows = _recipient_rows(meeting_id, recipients)
+        if rows:
+            self.supabase.table('meeting_recipients').upsert(
+                rows,
+                on_conflict='meeting_id,recipient_key',
+                ignore_duplicates=True,
+                returning='minimal'
+            ).execute()
+    
     def get_upcoming_meetings(self, organization_id: Optional[str] = None) -> List[Dict]:
         """Get upcoming meetings"""
         query = self.supabase.table('meetings').select('*').gte('scheduled_at', datetime.utcnow().isoformat())
@@ -127,85 +530,83 @@ class SupabaseService:
     # Template Management (mapped to meetings and meeting_minutes)
     def create_template(self, user_id: str, title: str, content: str, **kwargs) -> Dict:
         """Create a new template (stored as meeting with minutes)"""
+        created = self.create_templates([dict(kwargs, user_id=user_id, title=title, content=content)])
+        return created[0] if created else None
+    
+    def create_templates(self, templates: List[Dict]) -> List[Dict]:
+        """Create several templates in one atomic round trip
+        
+        Each item takes the same fields as create_template (user_id, title,
+        content plus optional template details). The meetings and their
+        minutes are written by the create_templates Postgres function in a
+        single transaction; see SUPABASE_MIGRATION.md.
+        """
+        if not templates:
+            return []
+        
+        payload = _template_payload(templates)
+        
         try:
-            # First create a meeting marked as template
-            meeting_data = {
-                'organization_id': None,  # Will be set later if needed
-                'meeting_code': f"TEMPLATE_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                'title': title,
-                'scheduled_at': kwargs.get('meeting_date', datetime.utcnow().isoformat()),
-                'duration_mins': int(kwargs.get('duration', '30').split()[0]) if isinstance(kwargs.get('duration'), str) else kwargs.get('duration', 30),
-                'description': kwargs.get('additional_notes', ''),
-                'is_template': True,
-                'template_type': 'meeting'
-            }
-            
-            meeting_response = self.supabase.table('meetings').insert(meeting_data).execute()
-            meeting = meeting_response.data[0] if meeting_response.data else None
-            
-            if meeting:
-                # Create meeting minutes with the template content
-                minutes_data = {
-                    'meeting_id': meeting['id'],
-                    'summary': kwargs.get('additional_notes', ''),
-                    'full_mom': content,
-                    'created_by': user_id
-                }
-                
-                minutes_response = self.supabase.table('meeting_minutes').insert(minutes_data).execute()
-                
-                # Return combined data
-                return {
-                    'id': meeting['id'],
-                    'title': title,
-                    'content': content,
-                    'user_id': user_id,
-                    **kwargs
-                }
-            
-            return None
+            response = self.supabase.rpc('create_templates', {'templates': payload}).execute()
+            rows = response.data if response.data else []
         except Exception as e:
-            if 'column meetings.is_template does not exist' in str(e):
+            if 'create_templates' in str(e) and ('PGRST202' in str(e) or 'Could not find the function' in str(e)):
+                print("Warning: create_templates function does not exist. Please run SUPABASE_MIGRATION.md.")
+                rows = self._create_templates_fallback(payload)
+            elif 'column meetings.is_template does not exist' in str(e) or 'column "is_template"' in str(e):
                 print("Warning: is_template column does not exist. Please add it to your meetings table.")
                 print("SQL command to run in Supabase: ALTER TABLE meetings ADD COLUMN is_template BOOLEAN DEFAULT FALSE;")
-                return None
+                return []
             else:
                 raise e
+        
+        self._count_cache.clear()
+        return _created_templates(rows, templates)
+    
+    def _create_templates_fallback(self, payload: List[Dict]) -> List[Dict]:
+        """Two batched inserts for databases without the create_templates function
+        
+        Not atomic, so the meetings are deleted again if the minutes insert fails.
+        """
+        self._store_bodies([item['body'] for item in payload if item['body']])
+        
+        meeting_response = self.supabase.table('meetings').insert(_template_meeting_rows(payload)).execute()
+        meetings = meeting_response.data if meeting_response.data else []
+        
+        minutes_data = _template_minutes_rows(meetings, payload)
+        
+        try:
+            if minutes_data:
+                self.supabase.table('meeting_minutes').insert(minutes_data).execute()
+        except Exception:
+            self.supabase.table('meetings').delete().in_('id', [m['id'] for m in meetings]).execute()
+            raise
+        
+        return [{'id': meeting['id']} for meeting in meetings]
+    
+    def _store_bodies(self, rows: List[Dict]):
+        """Insert the bodies not stored yet; meeting_minutes triggers count their references"""
+        rows = list({row['digest']: row for row in rows}.values())
+        if rows:
+            self.supabase.table('template_bodies').upsert(rows, on_conflict='digest', ignore_duplicates=True).execute()
+    
+    def _bodies(self, meetings: List[Dict]) -> Dict[str, str]:
+        """Stored bodies of the templates in meetings; only uncached ones are fetched"""
+        bodies, missing = cached_bodies(_body_digests(meetings))
+        if missing:
+            response = self.supabase.table('template_bodies').select('digest, body, encoding').in_('digest', missing).execute()
+            bodies.update(remember_bodies(response.data or []))
+        return bodies
     
     def get_templates(self, user_id: Optional[str] = None) -> List[Dict]:
         """Get templates (meetings with is_template=True)"""
         try:
-            # Query meetings that are templates
-            query = self.supabase.table('meetings').select('*, meeting_minutes(*)').eq('is_template', True)
-            
-            if user_id:
-                # Filter by created_by in meeting_minutes
-                minutes_query = self.supabase.table('meeting_minutes').select('meeting_id, created_by').eq('created_by', user_id).execute()
-                meeting_ids = [item['meeting_id'] for item in minutes_query.data] if minutes_query.data else []
-                
-                if meeting_ids:
-                    response = query.in_('id', meeting_ids).execute()
-                else:
-                    return []
-            else:
-                response = query.execute()
+            response = _templates_query(self.supabase.table('meetings'), user_id).execute()
             
-            templates = []
-            for meeting in response.data if response.data else []:
-                if meeting.get('meeting_minutes'):
-                    minutes = meeting['meeting_minutes']
-                    templates.append({
-                        'id': meeting['id'],
-                        'title': meeting['title'],
-                        'content': minutes.get('full_mom', ''),
-                        'user_id': minutes.get('created_by'),
-                        'meeting_topic': meeting['title'],
-                        'meeting_date': meeting['scheduled_at'],
-                        'duration': f"{meeting['duration_mins']} minutes",
-                        'additional_notes': minutes.get('summary', '')
-                    })
-            
-            return templates
+            meetings = response.data or []
+            bodies = self._bodies(meetings)
+            templates = [_template_from_meeting(meeting, bodies) for meeting in meetings]
+            return [template for template in templates if template]
         except Exception as e:
             if 'column meetings.is_template does not exist' in str(e):
                 print("Warning: is_template column does not exist. Please add it to your meetings table.")
@@ -214,25 +615,46 @@ class SupabaseService:
             else:
                 raise e
     
+    def get_template_listing(self, user_id: str, after: Optional[str] = None,
+                             limit: int = 20) -> Dict:
+        """Get one keyset page of a user's templates, newest first
+        
+        Only the listing columns are selected, so the rendered HTML in
+        meeting_minutes.full_mom never leaves the database.
+        """
+        try:
+            query = _template_listing_query(self.supabase.table('meetings'), user_id, after, limit)
+            response = query.execute()
+            return _template_listing_page(response.data or [], user_id, limit)
+        except Exception as e:
+            if 'column meetings.is_template does not exist' in str(e):
+                print("Warning: is_template column does not exist. Please add it to your meetings table.")
+                print("SQL command to run in Supabase: ALTER TABLE meetings ADD COLUMN is_template BOOLEAN DEFAULT FALSE;")
+                return {'templates': [], 'next_cursor': None}
+            else:
+                raise e
+    
+    def count_templates(self, user_id: Optional[str] = None) -> int:
+        """Count templates server-side, cached briefly per user"""
+        return self._count_cache.get_or_load(('templates', user_id), lambda: self._count_templates(user_id))
+    
+    def _count_templates(self, user_id: Optional[str]) -> int:
+        try:
+            query = _count_templates_query(self.supabase.table('meetings'), user_id, self.count_method)
+            return query.execute().count or 0
+        except Exception as e:
+            if 'column meetings.is_template does not exist' in str(e):
+                return 0
+            else:
+                raise e
+    
     def get_template(self, template_id: str) -> Optional[Dict]:
         """Get a specific template"""
         try:
             response = self.supabase.table('meetings').select('*, meeting_minutes(*)').eq('id', template_id).eq('is_template', True).execute()
-            if response.data:
-                meeting = response.data[0]
-                if meeting.get('meeting_minutes'):
-                    minutes = meeting['meeting_minutes']
-                    return {
-                        'id': meeting['id'],
-                        'title': meeting['title'],
-                        'content': minutes.get('full_mom', ''),
-                        'user_id': minutes.get('created_by'),
-                        'meeting_topic': meeting['title'],
-                        'meeting_date': meeting['scheduled_at'],
-                        'duration': f"{meeting['duration_mins']} minutes",
-                        'additional_notes': minutes.get('summary', '')
-                    }
-            return None
+            if not response.data:
+                return None
+            return _template_from_meeting(response.data[0], self._bodies(response.data))
         except Exception as e:
             if 'column meetings.is_template does not exist' in str(e):
                 print("Warning: is_template column does not exist. Please add it to your meetings table.")
@@ -243,38 +665,60 @@ class SupabaseService:
     
     def update_template(self, template_id: str, **kwargs) -> Dict:
         """Update a template"""
-        # Update meeting
-        meeting_updates = {}
-        if 'title' in kwargs:
-            meeting_updates['title'] = kwargs['title']
-        if 'meeting_date' in kwargs:
-            meeting_updates['scheduled_at'] = kwargs['meeting_date']
-        if 'duration' in kwargs:
-            duration_str = kwargs['duration']
-            if isinstance(duration_str, str) and 'minutes' in duration_str:
-                meeting_updates['duration_mins'] = int(duration_str.split()[0])
+        meeting_updates, minutes_updates, body = _template_updates(kwargs)
         
+        # Update meeting
         if meeting_updates:
             self.supabase.table('meetings').update(meeting_updates).eq('id', template_id).execute()
         
-        # Update meeting minutes
-        minutes_updates = {}
-        if 'content' in kwargs:
-            minutes_updates['full_mom'] = kwargs['content']
-        if 'additional_notes' in kwargs:
-            minutes_updates['summary'] = kwargs['additional_notes']
+        # New content is stored and referenced in one transaction, so a
+        # concurrent delete cannot collect its body in between
+        if body:
+            self._set_template_body(template_id, body)
+            minutes_updates = {k: v for k, v in minutes_updates.items() if k not in ('full_mom', 'body_digest')}
         
+        # Update meeting minutes
         if minutes_updates:
             self.supabase.table('meeting_minutes').update(minutes_updates).eq('meeting_id', template_id).execute()
         
         return self.get_template(template_id)
     
+    def _set_template_body(self, template_id: str, body: Dict):
+        """Store body and point the template's minutes at it (set_template_body function)"""
+        try:
+            self.supabase.rpc('set_template_body', {'template_id': template_id, 'new_body': body}).execute()
+        except Exception as e:
+            if 'set_template_body' in str(e) and ('PGRST202' in str(e) or 'Could not find the function' in str(e)):
+                print("Warning: set_template_body function does not exist. Please run SUPABASE_MIGRATION.md.")
+                self._set_template_body_fallback(template_id, body)
+            else:
+                raise e
+    
+    def _set_template_body_fallback(self, template_id: str, body: Dict):
+        """Store the body, then reference it
+        
+        Not atomic: if the body is collected in between, the foreign key
+        rejects the update, so the body is stored again and the update retried.
+        """
+        for attempt in range(2):
+            self._store_bodies([body])
+            try:
+                self.supabase.table('meeting_minutes').update(
+                    {'full_mom': None, 'body_digest': body['digest']}
+                ).eq('meeting_id', template_id).execute()
+                return
+            except Exception as e:
+                if attempt or '23503' not in str(e):
+                    raise
+    
     def delete_template(self, template_id: str) -> bool:
         """Delete a template"""
-        # Delete meeting minutes first
+        # Delete meeting minutes first; their trigger deletes a stored body
+        # with its last reference
         self.supabase.table('meeting_minutes').delete().eq('meeting_id', template_id).execute()
         # Delete meeting
         response = self.supabase.table('meetings').delete().eq('id', template_id).execute()
+        self._count_cache.clear()
         return len(response.data) > 0 if response.data else False
     
     # Distribution Management
@@ -283,96 +727,57 @@ class SupabaseService:
         """Create a new distribution record"""
         
         # Insert into social_posts table
-        distribution_data = {
-            'meeting_id': template_id,
-            'platforms': json.dumps([method]),
-            'status': kwargs.get('status', 'pending'),
-            'published_at': kwargs.get('sent_at') if kwargs.get('status') == 'sent' else None
-        }
+        distribution_data = _distribution_record(template_id, method, kwargs)
         
         response = self.supabase.table('social_posts').insert(distribution_data).execute()
+        self._count_cache.clear()
         
         if response.data:
-            distribution_id = response.data[0]['id']
-            
-            # Store recipients in meeting_attendees table
-            recipients_data = kwargs.get('formatted_recipients')
-            if recipients_data:
-                try:
-                    recipients_list = json.loads(recipients_data) if isinstance(recipients_data, str) else recipients_data
-                    
-                    # Check if attendees record exists for this meeting
-                    existing_response = self.supabase.table('meeting_attendees').select('*').eq('meeting_id', template_id).execute()
-                    
-                    if existing_response.data:
-                        # Update existing record
-                        attendee_record = existing_response.data[0]
-                        current_attendees = attendee_record.get('attendees', [])
-                        # Add new recipients to existing attendees
-                        current_attendees.extend(recipients_list)
-                        
-                        self.supabase.table('meeting_attendees').update({
-                            'attendees': current_attendees
-                        }).eq('meeting_id', template_id).execute()
-                    else:
-                        # Create new attendees record
-                        attendee_data = {
-                            'meeting_id': template_id,
-                            'attendees': recipients_list
-                        }
-                        self.supabase.table('meeting_attendees').insert(attendee_data).execute()
-                        
-                except Exception as e:
-                    print(f"Error storing recipients: {e}")
+            # Store recipients in meeting_recipients table
+            try:
+                recipients_list = _distribution_recipients(kwargs)
+                if recipients_list:
+                    self.add_meeting_recipients(template_id, recipients_list)
+            except Exception as e:
+                print(f"Error storing recipients: {e}")
             
             return response.data[0]
         
         return None
     
-    def get_distributions(self, user_id: Optional[str] = None) -> List[Dict]:
-        """Get distributions with recipients"""
+    def get_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                          method: Optional[str] = None, after: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict]:
+        """Get distributions with recipients, newest first"""
+        return self.get_distributions_page(user_id, status=status, method=method,
+                                           after=after, limit=limit)['distributions']
+    
+    def get_distributions_page(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                               method: Optional[str] = None, after: Optional[str] = None,
+                               limit: Optional[int] = None) -> Dict:
+        """Get one keyset page of distributions plus the cursor for the next page
         
-        # Get distributions from social_posts
-        query = self.supabase.table('social_posts').select('*')
+        Recipients and the owning user are pulled in through a single embedded
+        select on the parent meeting, so the cost is one request per page no
+        matter how many distributions the page holds.
+        """
+        query = _distributions_query(self.supabase.table('social_posts'), user_id, status, method, after, limit)
         response = query.execute()
-        
-        distributions = []
-        for post in response.data if response.data else []:
-            # Get recipients from meeting_attendees
-            attendees_response = self.supabase.table('meeting_attendees').select('attendees').eq('meeting_id', post['meeting_id']).execute()
-            
-            recipients = []
-            if attendees_response.data and attendees_response.data[0].get('attendees'):
-                recipients = attendees_response.data[0]['attendees']
-            
-            # Get the user_id from meeting_minutes to filter by user if needed
-            if user_id:
-                minutes_response = self.supabase.table('meeting_minutes').select('created_by').eq('meeting_id', post['meeting_id']).execute()
-                if minutes_response.data:
-                    created_by = minutes_response.data[0]['created_by']
-                    if created_by != user_id:
-                        continue
-                else:
-                    continue
-                user_id_for_record = created_by
-            else:
-                # Get user_id for the record
-                minutes_response = self.supabase.table('meeting_minutes').select('created_by').eq('meeting_id', post['meeting_id']).execute()
-                user_id_for_record = minutes_response.data[0]['created_by'] if minutes_response.data else None
-            
-            distributions.append({
-                'id': post['id'],
-                'template_id': post['meeting_id'],
-                'method': json.loads(post['platforms'])[0] if post['platforms'] else 'unknown',
-                'recipients': json.dumps(recipients),
-                'status': post['status'],
-                'sent_at': post['published_at'],
-                'created_at': post['created_at'],
-                'updated_at': post['updated_at'],
-                'user_id': user_id_for_record
-            })
-        
-        return distributions
+        return _distributions_page(response.data or [], limit)
+    
+    def count_distributions(self, user_id: Optional[str] = None, status: Optional[str] = None,
+                            method: Optional[str] = None) -> int:
+        """Count distributions server-side, cached briefly per filter set"""
+        return self._count_cache.get_or_load(
+            ('distributions', user_id, status, method),
+            lambda: self._count_distributions(user_id, status, method)
+        )
+    
+    def _count_distributions(self, user_id: Optional[str], status: Optional[str],
+                             method: Optional[str]) -> int:
+        query = _count_distributions_query(self.supabase.table('social_posts'), user_id, status,
+                                           method, self.count_method)
+        return query.execute().count or 0
     
     def update_distribution_status(self, distribution_id: str, status: str, **kwargs) -> Dict:
         """Update distribution status"""
@@ -381,6 +786,7 @@ class SupabaseService:
             update_data['published_at'] = datetime.utcnow().isoformat()
         
         response = self.supabase.table('social_posts').update(update_data).eq('id', distribution_id).execute()
+        self._count_cache.clear()
         return response.data[0] if response.data else None
     
     # User Management (mapped to contacts)
@@ -399,44 +805,17 @@ class SupabaseService:
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         response = self.supabase.table('contacts').select('*').eq('email', email).execute()
-        if response.data:
-            contact = response.data[0]
-            return {
-                'id': contact['id'],
-                'username': contact['name'],
-                'email': contact['email'],
-                'password_hash': 'hashed_password',  # We'll need to handle this differently
-                'created_at': contact['created_at']
-            }
-        return None
+        return _user_from_contact(response.data[0]) if response.data else None
     
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username (name in contacts)"""
         response = self.supabase.table('contacts').select('*').eq('name', username).execute()
-        if response.data:
-            contact = response.data[0]
-            return {
-                'id': contact['id'],
-                'username': contact['name'],
-                'email': contact['email'],
-                'password_hash': 'hashed_password',  # We'll need to handle this differently
-                'created_at': contact['created_at']
-            }
-        return None
+        return _user_from_contact(response.data[0]) if response.data else None
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
         response = self.supabase.table('contacts').select('*').eq('id', user_id).execute()
-        if response.data:
-            contact = response.data[0]
-            return {
-                'id': contact['id'],
-                'username': contact['name'],
-                'email': contact['email'],
-                'password_hash': 'hashed_password',  # We'll need to handle this differently
-                'created_at': contact['created_at']
-            }
-        return None
+        return _user_from_contact(response.data[0]) if response.data else None
     
     # Organization Management
     def get_organizations(self) -> List[Dict]:
@@ -477,33 +856,27 @@ class SupabaseService:
             print(f"Error with organization: {e}")
             organization_id = None
         
-        demo_contacts = [
-            # Internal members
-            {'email': 'john.doe@company.com', 'name': 'John Doe', 'member_type': 'internal', 'organization_id': organization_id},
-            {'email': 'jane.smith@company.com', 'name': 'Jane Smith', 'member_type': 'internal', 'organization_id': organization_id},
-            {'email': 'mike.johnson@company.com', 'name': 'Mike Johnson', 'member_type': 'internal', 'organization_id': organization_id},
-            {'email': 'sarah.wilson@company.com', 'name': 'Sarah Wilson', 'member_type': 'internal', 'organization_id': organization_id},
-            {'email': 'david.brown@company.com', 'name': 'David Brown', 'member_type': 'internal', 'organization_id': organization_id},
-            
-            # External contacts
-            {'email': 'client1@external.com', 'name': 'Client One', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'client2@external.com', 'name': 'Client Two', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'partner1@partner.com', 'name': 'Partner One', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'partner2@partner.com', 'name': 'Partner Two', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'vendor1@vendor.com', 'name': 'Vendor One', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'consultant@consulting.com', 'name': 'External Consultant', 'member_type': 'external', 'organization_id': organization_id},
-            {'email': 'investor@investments.com', 'name': 'Investor Contact', 'member_type': 'external', 'organization_id': organization_id},
-        ]
-        
-        for contact in demo_contacts:
-            try:
-                # Check if contact already exists
-                existing = self.supabase.table('contacts').select('id').eq('email', contact['email']).execute()
-                if not existing.data:
-                    self.add_contact(**contact)
-            except Exception as e:
-                # Contact might already exist, skip silently
-                continue
+        demo_contacts = _demo_contacts(organization_id)
+        
+        # One round trip for all contacts; existing emails are left untouched
+        try:
+            self.supabase.table('contacts').upsert(
+                demo_contacts,
+                on_conflict='email',
+                ignore_duplicates=True,
+                returning='minimal'
+            ).execute()
+        except Exception as e:
+            if 'ON CONFLICT' not in str(e) and '42P10' not in str(e):
+                raise e
+            print("Warning: contacts.email is not unique. Please run SUPABASE_MIGRATION.md.")
+            # Without the constraint: one lookup plus one batched insert
+            emails = [contact['email'] for contact in demo_contacts]
+            existing = self.supabase.table('contacts').select('email').in_('email', emails).execute()
+            known = {row['email'] for row in existing.data or []}
+            missing = [contact for contact in demo_contacts if contact['email'] not in known]
+            if missing:
+                self.supabase.table('contacts').insert(missing, returning='minimal').execute()
 
     def ensure_database_schema(self):
         """Ensure all required database columns exist"""
@@ -0,0 +1,114 @@
+import html
+import re
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# {{name}}, {{name|filter}}, and {{#name}}...{{/name}} sections that are
+# only rendered when the value is truthy
+_TOKEN = re.compile(r'\{\{([#/]?)(\w+)(?:\|(\w+))?\}\}')
+
+FILTERS: Dict[str, Callable[[Any], str]] = {
+    'upper': lambda value: str(value).upper()
+}
+
+class CompiledTemplate:
+    """A layout compiled once into static chunks and placeholder slots
+
+    The chunks become string constants of a generated render function, so
+    a render is a single join of the chunks with the slot values; the
+    static markup is never re-parsed, re-formatted or copied into
+    intermediate strings.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.names = set()
+        code = f"def render(values):\n    return {self._join(source)}\n"
+        namespace = {'FILTERS': FILTERS}
+        exec(compile(code, '<template>', 'exec'), namespace)
+        self._render = namespace['render']
+
+    def _join(self, source: str) -> str:
+        """Python expression joining the chunks and slots of source"""
+        items: List[str] = []
+        position = 0
+        while True:
+            match = _TOKEN.search(source, position)
+            if match is None:
+                break
+            kind, name, filter_name = match.groups()
+            if match.start() > position:
+                items.append(repr(source[position:match.start()]))
+            self.names.add(name)
+            if kind == '/':
+                raise ValueError(f"Unexpected {{{{/{name}}}}} in template")
+            if kind == '#':
+                end = source.find('{{/%s}}' % name, match.end())
+                if end < 0:
+                    raise ValueError(f"Unclosed section {{{{#{name}}}}} in template")
+                items.append(f"({self._join(source[match.end():end])} if values[{name!r}] else '')")
+                position = end + len('{{/%s}}' % name)
+            else:
+                if filter_name and filter_name not in FILTERS:
+                    raise ValueError(f"Unknown template filter: {filter_name}")
+                if filter_name:
+                    items.append(f"FILTERS[{filter_name!r}](values[{name!r}])")
+                else:
+                    items.append(f"str(values[{name!r}])")
+                position = match.end()
+        if position < len(source):
+            items.append(repr(source[position:]))
+        return "''.join((%s,))" % ', '.join(items) if items else "''"
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Fill every slot from values (a missing name raises KeyError)"""
+        return self._render(values)
+
+_compiled: Dict[str, CompiledTemplate] = {}
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a layout, sharing the result between identical sources"""
+    template = _compiled.get(source)
+    if template is None:
+        template = _compiled[source] = CompiledTemplate(source)
+    return template
+
+# Per-recipient fields a saved invitation may contain, filled at send time
+MERGE_FIELDS = ('name', 'organization', 'join_link')
+
+class MergeTemplate:
+    """Rendered content split once into invariant segments and merge-field slots
+
+    segments has one more entry than slots: segment, slot, segment, ...
+    Only MERGE_FIELDS are slots; any other {{...}} text is left as is.
+    Values come from recipient data, so they are HTML-escaped.
+    """
+
+    def __init__(self, source: str, fields: Tuple[str, ...] = MERGE_FIELDS):
+        pattern = re.compile(r'\{\{\s*(%s)\s*\}\}' % '|'.join(map(re.escape, fields)))
+        pieces = pattern.split(source)
+        self.segments: List[str] = pieces[0::2]
+        self.slots: List[str] = pieces[1::2]
+
+    @property
+    def personalized(self) -> bool:
+        return bool(self.slots)
+
+    @staticmethod
+    def escape(value: Any) -> str:
+        return html.escape(str(value or ''), quote=True)
+
+    def render(self, values: Dict[str, Any], segments: Optional[List[Any]] = None,
+               encode: Optional[Callable[[str], Any]] = None, join: Callable[[List[Any]], Any] = ''.join) -> Any:
+        """The content for one recipient; missing fields are left empty
+
+        Callers that keep the segments pre-encoded (as quoted-printable
+        mail bodies do) pass them with the matching encode for values and
+        join for the parts.
+        """
+        segments = segments or self.segments
+        parts = [segments[0]]
+        for name, segment in zip(self.slots, segments[1:]):
+            value = self.escape(values.get(name))
+            parts.append(encode(value) if encode else value)
+            parts.append(segment)
+        return join(parts)
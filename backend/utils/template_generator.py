@@ -1,174 +1,18 @@
 import json
+import os
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
+from urllib.parse import quote
 import re
 
-class TemplateGenerator:
-    """Professional template generator for meeting invitations"""
-    
-    def __init__(self):
-        self.templates = {}
-        self._initialize_templates()
-    
-    def _initialize_templates(self):
-        """Initialize all templates"""
-        self.templates = {
-            'formal_internal': {
-                'name': 'Formal Internal Meeting',
-                'subject': 'Meeting Invitation: {meeting_topic}',
-                'content': self._get_formal_internal_template()
-            },
-            'casual_internal': {
-                'name': 'Casual Internal Meeting',
-                'subject': 'Quick Chat: {meeting_topic}',
-                'content': self._get_casual_internal_template()
-            },
-            'client_meeting': {
-                'name': 'Client Meeting',
-                'subject': 'Meeting Request: {meeting_topic}',
-                'content': self._get_client_meeting_template()
-            },
-            'partner_meeting': {
-                'name': 'Partner Meeting',
-                'subject': 'Partnership Discussion: {meeting_topic}',
-                'content': self._get_partner_meeting_template()
-            },
-            'vendor_meeting': {
-                'name': 'Vendor Meeting',
-                'subject': 'Vendor Discussion: {meeting_topic}',
-                'content': self._get_vendor_meeting_template()
-            },
-            'investor_meeting': {
-                'name': 'Investor Meeting',
-                'subject': 'Investor Update: {meeting_topic}',
-                'content': self._get_investor_meeting_template()
-            },
-            'team_standup': {
-                'name': 'Team Standup',
-                'subject': 'Daily Standup: {meeting_topic}',
-                'content': self._get_team_standup_template()
-            },
-            'project_review': {
-                'name': 'Project Review',
-                'subject': 'Project Review: {meeting_topic}',
-                'content': self._get_project_review_template()
-            }
-        }
-    
-    def get_available_templates(self) -> List[Dict[str, str]]:
-        """Get list of available templates"""
-        return [
-            {'id': key, 'name': template['name']} 
-            for key, template in self.templates.items()
-        ]
-    
-    def generate_template(self, template_type: str, **kwargs) -> Dict[str, Any]:
-        """Generate a template with the given parameters"""
-        if template_type not in self.templates:
-            raise ValueError(f"Template type '{template_type}' not found")
-        
-        # Create the template content directly
-        content = self._create_modern_template(
-            meeting_topic=kwargs.get('meeting_topic', ''),
-            speaker_name=kwargs.get('speaker_name', ''),
-            meeting_date=kwargs.get('meeting_date', ''),
-            meeting_time=kwargs.get('meeting_time', ''),
-            duration=kwargs.get('duration', '30 minutes'),
-            meeting_link=kwargs.get('meeting_link', ''),
-            location=kwargs.get('location', ''),
-            attendees=kwargs.get('attendees', ''),
-            additional_notes=kwargs.get('additional_notes', ''),
-            priority=kwargs.get('priority', 'Medium'),
-            template_type=template_type
-        )
-        
-        # Get the subject from the template
-        template = self.templates[template_type]
-        subject = template['subject'].format(**kwargs)
-        
-        return {
-            'title': kwargs.get('meeting_topic', 'Meeting Invitation'),
-            'content': content,
-            'subject': subject,
-            'meeting_topic': kwargs.get('meeting_topic', ''),
-            'speaker_name': kwargs.get('speaker_name', ''),
-            'meeting_date': kwargs.get('meeting_date', ''),
-            'meeting_time': kwargs.get('meeting_time', ''),
-            'duration': kwargs.get('duration', '30 minutes'),
-            'meeting_link': kwargs.get('meeting_link', ''),
-            'location': kwargs.get('location', ''),
-            'attendees': kwargs.get('attendees', ''),
-            'additional_notes': kwargs.get('additional_notes', ''),
-            'meeting_type': template_type,
-            'priority': kwargs.get('priority', 'Medium')
-        }
-    
-    def _get_formal_internal_template(self) -> str:
-        return ""
-
-    def _get_casual_internal_template(self) -> str:
-        return ""
-
-    def _get_client_meeting_template(self) -> str:
-        return ""
-
-    def _get_partner_meeting_template(self) -> str:
-        return ""
-
-    def _get_vendor_meeting_template(self) -> str:
-        return ""
-
-    def _get_investor_meeting_template(self) -> str:
-        return ""
-
-    def _get_team_standup_template(self) -> str:
-        return ""
-
-    def _get_project_review_template(self) -> str:
-        return ""
+from config import config
+from utils.cache import SizedLRUCache, TTLCache
+from utils.template_engine import MergeTemplate, compile_template
 
-    def _create_modern_template(self, **kwargs) -> str:
-        """Create a modern, professional template matching the image design"""
-        
-        # Get template type for styling
-        template_type = kwargs.get('template_type', 'formal_internal')
-        
-        # Determine meeting type label
-        meeting_type_labels = {
-            'formal_internal': 'TEAM MEETING',
-            'casual_internal': 'QUICK CHAT',
-            'client_meeting': 'CLIENT MEETING',
-            'partner_meeting': 'PARTNER MEETING',
-            'vendor_meeting': 'VENDOR MEETING',
-            'investor_meeting': 'INVESTOR MEETING',
-            'team_standup': 'TEAM STANDUP',
-            'project_review': 'PROJECT REVIEW'
-        }
-        
-        meeting_type_label = meeting_type_labels.get(template_type, 'MEETING')
-        
-        # Get priority color
-        priority = kwargs.get('priority', 'Medium')
-        if isinstance(priority, str):
-            priority = priority.strip()
-        priority_colors = {
-            'Low': '#28a745',
-            'Medium': '#ffc107',
-            'High': '#dc3545',
-            'Urgent': '#dc3545'
-        }
-        priority_color = priority_colors.get(priority, '#ffc107')
-        
-        # Format attendees
-        attendees = kwargs.get('attendees', '')
-        if isinstance(attendees, list):
-            attendees = ', '.join(attendees)
-        
-        # Format date and time
-        meeting_date = kwargs.get('meeting_date', 'TBD')
-        meeting_time = kwargs.get('meeting_time', 'TBD')
-        
-        return f"""
+# Invitation markup; every template type currently compiles this layout.
+# {{name}} slots and {{#name}}...{{/name}} sections are filled by
+# utils.template_engine, values are inserted as given.
+INVITATION_LAYOUT = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -221,7 +65,7 @@ class TemplateGenerator:
                                         <div style="font-size: 1.2rem; color: #000; font-style: italic; margin-bottom: 1rem;">Presents</div>
                                         <div style="font-size: 3.5rem; font-weight: 700; color: #000; margin: 0 0 1rem 0;">
                                             <span style="color: #8B4513; font-size: 2.5rem;">🧠</span>
-                                            <span>{kwargs.get('meeting_topic', 'Think Tank Meet')}</span>
+                                            <span>{{meeting_topic}}</span>
                                         </div>
                                         <div style="font-size: 1.3rem; color: #000; font-weight: 500; margin: 0;">Where Ideas for Meaningful Education Begin</div>
                                     </div>
@@ -245,12 +89,12 @@ class TemplateGenerator:
                                                     <tr>
                                                         <td style="text-align: center; padding-right: 2rem;">
                                                             <span style="color: #6c757d; font-size: 1.2rem;">📅</span>
-                                                            <span style="font-size: 1.5rem; font-weight: 700; color: #000;">{meeting_date.upper() if meeting_date != 'TBD' else 'TBD'}</span>
+                                                            <span style="font-size: 1.5rem; font-weight: 700; color: #000;">{{meeting_date|upper}}</span>
                                                         </td>
                                                         <td style="width: 2px; background: #6c757d; opacity: 0.3; padding: 0 1rem;"></td>
                                                         <td style="text-align: center; padding-left: 2rem;">
                                                             <span style="color: #6c757d; font-size: 1.2rem;">⏰</span>
-                                                            <span style="font-size: 1.5rem; font-weight: 700; color: #000;">{meeting_time.upper() if meeting_time != 'TBD' else 'TBD'}</span>
+                                                            <span style="font-size: 1.5rem; font-weight: 700; color: #000;">{{meeting_time|upper}}</span>
                                                             <span style="font-size: 1.2rem; font-weight: 700; color: #000;">SHARP</span>
                                                         </td>
                                                     </tr>
@@ -279,7 +123,7 @@ class TemplateGenerator:
                                                              <span style="color: #667eea; font-size: 1.5rem;">📅</span>
                                                              <div style="margin-top: 0.5rem;">
                                                                  <div style="font-size: 0.75rem; color: #6c757d; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">DATE</div>
-                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{meeting_date}</div>
+                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{{meeting_date}}</div>
                                                              </div>
                                                          </td>
                                                      </tr>
@@ -292,7 +136,7 @@ class TemplateGenerator:
                                                              <span style="color: #667eea; font-size: 1.5rem;">🕐</span>
                                                              <div style="margin-top: 0.5rem;">
                                                                  <div style="font-size: 0.75rem; color: #6c757d; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">TIME</div>
-                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{meeting_time}</div>
+                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{{meeting_time}}</div>
                                                              </div>
                                                          </td>
                                                      </tr>
@@ -307,7 +151,7 @@ class TemplateGenerator:
                                                              <span style="color: #667eea; font-size: 1.5rem;">⏱️</span>
                                                              <div style="margin-top: 0.5rem;">
                                                                  <div style="font-size: 0.75rem; color: #6c757d; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">DURATION</div>
-                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{kwargs.get('duration', '30 minutes')}</div>
+                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{{duration}}</div>
                                                              </div>
                                                          </td>
                                                      </tr>
@@ -320,7 +164,7 @@ class TemplateGenerator:
                                                              <span style="color: #667eea; font-size: 1.5rem;">🎤</span>
                                                              <div style="margin-top: 0.5rem;">
                                                                  <div style="font-size: 0.75rem; color: #6c757d; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">SPEAKER</div>
-                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{kwargs.get('speaker_name', 'TBD')}</div>
+                                                                 <div style="font-size: 1rem; color: #2c3e50; font-weight: 600;">{{speaker_name}}</div>
                                                              </div>
                                                          </td>
                                                      </tr>
@@ -333,7 +177,7 @@ class TemplateGenerator:
                         </table>
                         
                         <!-- Meeting Link Section -->
-                        {f'''
+                        {{#meeting_link}}
                         <table width="100%" cellpadding="0" cellspacing="0">
                             <tr>
                                 <td style="padding: 0 2rem 2rem;">
@@ -341,19 +185,19 @@ class TemplateGenerator:
                                         <span style="color: #667eea; font-size: 1.2rem;">🔗</span>
                                         <h3 style="color: #2c3e50; font-weight: 600; margin: 0; font-size: 1.1rem;">Meeting Link</h3>
                                     </div>
-                                    <a href="{kwargs.get('meeting_link', '#')}" style="display: inline-block; background: #007bff; color: white; padding: 0.75rem 1.5rem; border-radius: 8px; text-decoration: none; font-weight: 600; margin-right: 1rem;">
+                                    <a href="{{meeting_link}}" style="display: inline-block; background: #007bff; color: white; padding: 0.75rem 1.5rem; border-radius: 8px; text-decoration: none; font-weight: 600; margin-right: 1rem;">
                                         <span style="margin-right: 0.5rem;">📹</span>ZOOM
                                     </a>
-                                    <a href="{kwargs.get('meeting_link', '#')}" style="display: inline-block; background: #17a2b8; color: white; padding: 0.75rem 1.5rem; border-radius: 8px; text-decoration: none; font-weight: 600;">
+                                    <a href="{{meeting_link}}" style="display: inline-block; background: #17a2b8; color: white; padding: 0.75rem 1.5rem; border-radius: 8px; text-decoration: none; font-weight: 600;">
                                         Join us
                                     </a>
                                 </td>
                             </tr>
                         </table>
-                        ''' if kwargs.get('meeting_link') else ''}
+                        {{/meeting_link}}
                         
                         <!-- Location Section -->
-                        {f'''
+                        {{#location}}
                         <table width="100%" cellpadding="0" cellspacing="0">
                             <tr>
                                 <td style="padding: 0 2rem 2rem;">
@@ -361,14 +205,14 @@ class TemplateGenerator:
                                         <span style="color: #667eea; font-size: 1.2rem;">📍</span>
                                         <h3 style="color: #2c3e50; font-weight: 600; margin: 0; font-size: 1.1rem;">Location</h3>
                                     </div>
-                                    <p style="color: #2c3e50; font-weight: 500; margin: 0; font-size: 1rem;">{kwargs.get('location', 'TBD')}</p>
+                                    <p style="color: #2c3e50; font-weight: 500; margin: 0; font-size: 1rem;">{{location}}</p>
                                 </td>
                             </tr>
                         </table>
-                        ''' if kwargs.get('location') else ''}
+                        {{/location}}
                         
                         <!-- Agenda Section -->
-                        {f'''
+                        {{#additional_notes}}
                         <table width="100%" cellpadding="0" cellspacing="0">
                             <tr>
                                 <td style="padding: 0 2rem 2rem;">
@@ -376,14 +220,14 @@ class TemplateGenerator:
                                         <span style="color: #667eea; font-size: 1.2rem;">📄</span>
                                         <h3 style="color: #2c3e50; font-weight: 600; margin: 0; font-size: 1.1rem;">Agenda</h3>
                                     </div>
-                                    <p style="color: #2c3e50; margin: 0; line-height: 1.6;">{kwargs.get('additional_notes', 'Discussing meeting objectives and key points')}</p>
+                                    <p style="color: #2c3e50; margin: 0; line-height: 1.6;">{{additional_notes}}</p>
                                 </td>
                             </tr>
                         </table>
-                        ''' if kwargs.get('additional_notes') else ''}
+                        {{/additional_notes}}
                         
                         <!-- Attendees Section -->
-                        {f'''
+                        {{#attendees}}
                         <table width="100%" cellpadding="0" cellspacing="0">
                             <tr>
                                 <td style="padding: 0 2rem 2rem;">
@@ -391,11 +235,11 @@ class TemplateGenerator:
                                         <span style="color: #667eea; font-size: 1.2rem;">👥</span>
                                         <h3 style="color: #2c3e50; font-weight: 600; margin: 0; font-size: 1.1rem;">Attendees</h3>
                                     </div>
-                                    <p style="color: #2c3e50; margin: 0; font-weight: 500;">{attendees if attendees else 'To be confirmed'}</p>
+                                    <p style="color: #2c3e50; margin: 0; font-weight: 500;">{{attendees}}</p>
                                 </td>
                             </tr>
                         </table>
-                        ''' if attendees else ''}
+                        {{/attendees}}
                         
                         <!-- Slogan Section -->
                         <table width="100%" cellpadding="0" cellspacing="0">
@@ -435,5 +279,178 @@ class TemplateGenerator:
         </html>
         """
 
+# Bump when INVITATION_LAYOUT changes the output for existing parameters;
+# saved templates record the version they were generated with
+TEMPLATE_VERSION = 1
+
+# Invitation parameters and their defaults, as filled into the layout
+PARAM_DEFAULTS = {
+    'meeting_topic': '',
+    'speaker_name': '',
+    'meeting_date': '',
+    'meeting_time': '',
+    'duration': '30 minutes',
+    'meeting_link': '',
+    'location': '',
+    'attendees': '',
+    'additional_notes': ''
+}
+
+class TemplateGenerator:
+    """Professional template generator for meeting invitations"""
+    
+    def __init__(self, cache_bytes: int = 0):
+        self.templates = {}
+        self._initialize_templates()
+        # Same standup every day, regenerate after a page refresh: identical
+        # requests are served from here instead of rendering again
+        self.render_cache = SizedLRUCache(cache_bytes) if cache_bytes > 0 else None
+        # Saved content split at its merge fields, reused for every recipient
+        self._merge_templates = TTLCache(maxsize=64, ttl=600)
+    
+    def _initialize_templates(self):
+        """Initialize all templates, compiling each layout once"""
+        self.templates = {
+            'formal_internal': {
+                'name': 'Formal Internal Meeting',
+                'subject': 'Meeting Invitation: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'casual_internal': {
+                'name': 'Casual Internal Meeting',
+                'subject': 'Quick Chat: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'client_meeting': {
+                'name': 'Client Meeting',
+                'subject': 'Meeting Request: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'partner_meeting': {
+                'name': 'Partner Meeting',
+                'subject': 'Partnership Discussion: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'vendor_meeting': {
+                'name': 'Vendor Meeting',
+                'subject': 'Vendor Discussion: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'investor_meeting': {
+                'name': 'Investor Meeting',
+                'subject': 'Investor Update: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'team_standup': {
+                'name': 'Team Standup',
+                'subject': 'Daily Standup: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            },
+            'project_review': {
+                'name': 'Project Review',
+                'subject': 'Project Review: {meeting_topic}',
+                'content': compile_template(INVITATION_LAYOUT)
+            }
+        }
+    
+    def get_available_templates(self) -> List[Dict[str, str]]:
+        """Get list of available templates"""
+        return [
+            {'id': key, 'name': template['name']} 
+            for key, template in self.templates.items()
+        ]
+    
+    def generate_template(self, template_type: str, **kwargs) -> Dict[str, Any]:
+        """Generate a template with the given parameters"""
+        if template_type not in self.templates:
+            raise ValueError(f"Template type '{template_type}' not found")
+        
+        params = {name: kwargs.get(name, default) for name, default in PARAM_DEFAULTS.items()}
+        
+        # Fill the compiled layout; sections render only for non-empty values
+        template = self.templates[template_type]
+        content = self._render(template_type, _layout_values(params))
+        
+        # Get the subject from the template
+        subject = template['subject'].format(**kwargs)
+        priority = kwargs.get('priority', 'Medium')
+        
+        return {
+            'title': kwargs.get('meeting_topic', 'Meeting Invitation'),
+            'content': content,
+            'subject': subject,
+            **params,
+            'meeting_type': template_type,
+            'priority': priority,
+            # Stored instead of the HTML; render_saved turns it back into content
+            'params': dict(params, priority=priority),
+            'template_version': TEMPLATE_VERSION
+        }
+    
+    def render_saved(self, template_type: str, params: Dict[str, Any], version: int = TEMPLATE_VERSION) -> str:
+        """Content of a template saved as its parameters (generate_template's 'params')"""
+        if template_type not in self.templates:
+            raise ValueError(f"Template type '{template_type}' not found")
+        if version != TEMPLATE_VERSION:
+            raise ValueError(f"Unsupported template version: {version}")
+        return self._render(template_type, _layout_values(params))
+
+    def _render(self, template_type: str, values: Dict[str, Any]) -> str:
+        layout = self.templates[template_type]['content']
+        if self.render_cache is None:
+            return layout.render(values)
+        return self.render_cache.get_or_load(render_key(template_type, values), lambda: layout.render(values))
+    
+    def render_batch(self, content: str, recipients: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Personalized copies of rendered content, one per recipient's merge values
+        
+        The {{name}}, {{organization}} and {{join_link}} fields are located
+        once; each copy only costs escaping and joining that recipient's
+        values. Copies are produced lazily, so thousands of recipients are
+        never held in memory at once.
+        """
+        merge = self.merge_template(content)
+        for values in recipients:
+            yield merge.render(values) if merge.personalized else content
+    
+    def merge_template(self, content: str) -> MergeTemplate:
+        """content split once at its merge fields; render_batch and the Gmail
+        messages (email_service.PersonalizedMessage) both fill this split"""
+        return self._merge_templates.get_or_load(content, lambda: MergeTemplate(content))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Render cache hit/miss/eviction counters and bytes held"""
+        return self.render_cache.stats() if self.render_cache is not None else {'enabled': False}
+
+def _layout_values(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Layout values from invitation parameters; attendee lists are joined"""
+    values = {name: params.get(name, default) for name, default in PARAM_DEFAULTS.items()}
+    if isinstance(values['attendees'], list):
+        values['attendees'] = ', '.join(values['attendees'])
+    return values
+
+def render_key(template_type: str, values: Dict[str, Any]) -> tuple:
+    """Canonical key of a render; values count as the text they render to"""
+    return (template_type, tuple(sorted((name, str(value)) for name, value in values.items())))
+
+def merge_values(email: str, name: str = '', organization: str = '', meeting_link: str = '') -> Dict[str, str]:
+    """Merge field values for one recipient; the join link identifies the invitee
+
+    meeting_link is the base of the join link. A link that is itself a
+    merge field (such as a template whose meeting link is {{join_link}})
+    has no URL to build on, so the Gmail distribution takes the base as
+    meetingLink.
+    """
+    join_link = ''
+    if meeting_link and '{{' not in meeting_link:
+        join_link = f"{meeting_link}{'&' if '?' in meeting_link else '?'}invitee={quote(email)}"
+    return {
+        'name': name or email.split('@')[0],
+        'organization': organization,
+        'join_link': join_link
+    }
+
 # Global instance
-template_generator = TemplateGenerator() 
\ No newline at end of file
+template_generator = TemplateGenerator(
+    cache_bytes=config[os.environ.get('FLASK_ENV', 'production')].RENDER_CACHE_MAX_BYTES
+) 
\ No newline at end of file
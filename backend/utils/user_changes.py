@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_changes (
+    user_id TEXT PRIMARY KEY,
+    changed_at REAL NOT NULL
+);
+"""
+
+class UserChanges:
+    """When each user was last changed, shared by every process on the host
+
+    Identity snapshots in sessions are checked against these markers, so a
+    contact or profile update handled by one web worker revokes snapshots
+    in all of them. The markers live in a local SQLite file (the job queue
+    file by default); a marker only matters for as long as a snapshot may
+    be trusted, so older ones are pruned.
+    """
+
+    def __init__(self, path: str, keep_for: float):
+        self.path = path
+        self.keep_for = keep_for
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """One connection per thread and process"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def mark(self, user_id: str) -> float:
+        """Record that user_id changed now; returns the marker time"""
+        now = time.time()
+        conn = self.conn
+        conn.execute('INSERT OR REPLACE INTO user_changes (user_id, changed_at) VALUES (?, ?)', (user_id, now))
+        conn.execute('DELETE FROM user_changes WHERE changed_at < ?', (now - self.keep_for,))
+        return now
+
+    def changed_at(self, user_id: str) -> Optional[float]:
+        row = self.conn.execute('SELECT changed_at FROM user_changes WHERE user_id = ?', (user_id,)).fetchone()
+        return row[0] if row else None